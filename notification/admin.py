@@ -3,10 +3,10 @@ from django.contrib.admin import display
 from django.db import models
 from tinymce.widgets import TinyMCE
 from django.forms import Textarea
-from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 
-from .models import Message, MessageTemplate, Notification
+from .models import Message, MessageTemplate, Notification, OutboxJob
+from .retry import retry_notifications, schedule_next_attempt
 
 # Register your models here.
 
@@ -57,19 +57,25 @@ class NotificationAdmin(admin.ModelAdmin):
         return False
 
     def send(self, request, queryset):
-        raise NotImplementedError
+        notifications = list(
+            queryset.filter(is_sent=False).select_related("to", "message")
+        )
+        schedule_next_attempt(notifications)
+        sent = retry_notifications(notifications)
+        level = messages.SUCCESS if sent == len(notifications) else messages.WARNING
+        self.message_user(
+            request, f"{sent} of {len(notifications)} notifications sent", level=level
+        )
 
     def read(self, request, queryset):
-        if queryset.count() > 0:
-            queryset.update(has_read=True, updated_at=timezone.now())
-
-        self.message_user(request, "Notification read", level=messages.SUCCESS)
+        count = queryset.mark_read()
+        self.message_user(request, f"{count} notifications read", level=messages.SUCCESS)
 
     def ignore(self, request, queryset):
-        if queryset.count() > 0:
-            queryset.update(is_ignored=True, updated_at=timezone.now())
-
-        self.message_user(request, "Notification ignored", level=messages.SUCCESS)
+        count = queryset.mark_ignored()
+        self.message_user(
+            request, f"{count} notifications ignored", level=messages.SUCCESS
+        )
 
     @display(description=_("Title"))
     def get_message_title(self, obj):
@@ -133,5 +139,28 @@ class MessageAdmin(admin.ModelAdmin):
     search_fields = ["mark", "title"]
     ordering = ("-id",)
 
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(OutboxJob)
+class OutboxJobAdmin(admin.ModelAdmin):
+    list_per_page = 15
+    list_display = [
+        "id",
+        "backend",
+        "status",
+        "attempts",
+        "available_at",
+        "claimed_by",
+        "updated_at",
+    ]
+    list_filter = ("status", "backend")
+    raw_id_fields = ["message"]
+    ordering = ("-id",)
+
     def has_change_permission(self, request, obj=None):
         return False
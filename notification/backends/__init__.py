@@ -20,10 +20,12 @@ from notification.backends.websocket import (
     WebsocketNotificationBackend,
     notify_by_websocket,
 )
-from notification.base import notify
+from notification.base import anotify, notify, notify_many
 
 __all__ = [
     "notify",
+    "anotify",
+    "notify_many",
     "notify_by_dummy",
     "notify_by_email",
     "notify_by_websocket",
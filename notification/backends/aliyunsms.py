@@ -18,6 +18,7 @@ class AliyunSMSNotificationBackend(BaseNotificationBackend):
     """  # noqa
 
     id = "aliyunsms"
+    recipient_fields = ()
     message_subtype = "plain"
     endpoint = "dysmsapi.aliyuncs.com"
 
@@ -67,6 +68,9 @@ class AliyunSMSNotificationBackend(BaseNotificationBackend):
         self.client = Dysmsapi20170525Client(config)
         super().__init__(*args, **kwargs)
 
+    def get_notification_recipient(self, notification):
+        return notification.notify_kwargs.get("phone_numbers")
+
     def make_content(self, title, content, receivers, recipient_field, **kwargs) -> dict:
         return {
             "sign_name": kwargs.get("sign_name") or self.sign_name,
@@ -78,16 +82,42 @@ class AliyunSMSNotificationBackend(BaseNotificationBackend):
         """
         For details, see: https://help.aliyun.com/document_detail/419273.htm?spm=a2c4g.11186623.0.0.34375695hoVPSt
         """  # noqa
-        for recipient in recipients:
-            phone = self.get_recipient(recipient, recipient_field)
-            notify_kwargs = {"phone_numbers": str(phone)}
-            try:
-                request = SendSmsRequest(**notify_kwargs, **message.content)
-                self.client.send_sms(request)
-            except Exception as e:
-                self.on_failure(message, recipient, e, save, notify_kwargs)
-            else:
-                self.on_success(message, recipient, save, notify_kwargs)
+        items = (
+            (recipient, str(self.get_recipient(recipient, recipient_field)))
+            for recipient in recipients
+        )
+
+        def send_sms(item):
+            request = SendSmsRequest(phone_numbers=item[1], **message.content)
+            return self.client.send_sms(request)
+
+        for (recipient, phone), _, exc in self.dispatch(send_sms, items):
+            self.handle_result(message, recipient, phone, exc, save)
+
+    async def async_perform_send(
+        self, message, recipients, recipient_field, save, **kwargs
+    ):
+        """
+        Send sms with the async api of aliyun sdk
+        """
+        items = (
+            (recipient, str(self.get_recipient(recipient, recipient_field)))
+            for recipient in recipients
+        )
+
+        async def send_sms(item):
+            request = SendSmsRequest(phone_numbers=item[1], **message.content)
+            return await self.client.send_sms_async(request)
+
+        async for (recipient, phone), _, exc in self.async_dispatch(send_sms, items):
+            self.handle_result(message, recipient, phone, exc, save)
+
+    def handle_result(self, message, recipient, phone, exc, save):
+        notify_kwargs = {"phone_numbers": phone}
+        if exc is not None:
+            self.on_failure(message, recipient, exc, save, notify_kwargs)
+        else:
+            self.on_success(message, recipient, save, notify_kwargs)
 
 
 def notify_by_aliyun_sms(
@@ -1,6 +1,5 @@
 import typing
 
-import requests
 from django.conf import settings
 from django.contrib.auth.models import User
 from django.core.exceptions import ImproperlyConfigured
@@ -8,7 +7,8 @@ from django.template import Context, Template
 from markdownify import markdownify
 
 from notification.base import BaseNotificationBackend, notify
-from notification.models import Message, MessageTemplate
+from notification.http import get_async_client, get_session
+from notification.models import Message
 
 
 class DingTalkChatbotNotificationBackend(BaseNotificationBackend):
@@ -18,7 +18,10 @@ class DingTalkChatbotNotificationBackend(BaseNotificationBackend):
     """
 
     id = "dingtalkchatbot"
+    recipient_fields = ()
     message_subtype = "markdown"
+    # Recipients are mentioned in the message content
+    streaming = False
 
     def __init__(self, *args, webhook=None, **kwargs):
         try:
@@ -34,9 +37,11 @@ class DingTalkChatbotNotificationBackend(BaseNotificationBackend):
 
         super().__init__(*args, **kwargs)
 
-    def render_template(self, template: MessageTemplate, context: dict) -> str:
+    def render_compiled_template(
+        self, compiled_template: Template, context: dict
+    ) -> str:
         try:
-            html_content = Template(template.content).render(Context(context))
+            html_content = compiled_template.render(Context(context))
             return markdownify(html_content)
         except Exception as e:
             raise ValueError("Render message failed: %s" % e)
@@ -73,10 +78,11 @@ class DingTalkChatbotNotificationBackend(BaseNotificationBackend):
         """
         For details, see: https://ding-doc.dingtalk.com/doc#/serverapi2/qf2nxq
         """
+        self.throttle()
         try:
-            resp = requests.post(self.webhook, json=message.content)
+            resp = get_session().post(self.webhook, json=message.content)
             resp.raise_for_status()
-            assert resp.json()["errcode"] == 0, resp.json()["errmsg"]
+            self.check_response(resp.json())
         except Exception as e:
             for recipient in recipients:
                 self.on_failure(message, recipient, e, save=save)
@@ -84,6 +90,33 @@ class DingTalkChatbotNotificationBackend(BaseNotificationBackend):
             for recipient in recipients:
                 self.on_success(message, recipient, save=save)
 
+    async def async_perform_send(
+        self, message: Message, recipients, recipient_field, save, **kwargs
+    ) -> None:
+        """
+        Send chatbot message with httpx if it is installed
+        """
+        client = await get_async_client()
+        if client is None:
+            return await super().async_perform_send(
+                message, recipients, recipient_field, save, **kwargs
+            )
+
+        await self.async_throttle()
+        try:
+            resp = await client.post(self.webhook, json=message.content)
+            resp.raise_for_status()
+            self.check_response(resp.json())
+        except Exception as e:
+            for recipient in recipients:
+                self.on_failure(message, recipient, e, save=save)
+        else:
+            for recipient in recipients:
+                self.on_success(message, recipient, save=save)
+
+    def check_response(self, ret: dict) -> None:
+        assert ret["errcode"] == 0, ret["errmsg"]
+
 
 def notify_by_dingtalk_chatbot(
     recipients: list[User] = None,
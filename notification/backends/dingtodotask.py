@@ -1,12 +1,17 @@
 import typing
 
-import requests
+from asgiref.sync import sync_to_async
 from django.conf import settings
 from django.contrib.auth.models import User
 from django.core.exceptions import ImproperlyConfigured
 
 from notification.base import BaseNotificationBackend, notify
+from notification.http import get_async_client, get_session
 from notification.models import Message
+from notification.tokens import (
+    get_dingtalk_access_token,
+    invalidate_dingtalk_access_token,
+)
 
 
 class DingTalkToDoTaskNotificationBackend(BaseNotificationBackend):
@@ -16,7 +21,9 @@ class DingTalkToDoTaskNotificationBackend(BaseNotificationBackend):
     """
 
     id = "dingtalktodotask"
+    recipient_fields = ()
     message_subtype = "plain"
+    send_url = "https://api.dingtalk.com/v1.0/todo/users/{unionid}/tasks"
 
     def __init__(self, *args, app_key=None, app_secret=None, **kwargs):
         try:
@@ -45,20 +52,38 @@ class DingTalkToDoTaskNotificationBackend(BaseNotificationBackend):
 
         super().__init__(*args, **kwargs)
 
+    def get_notification_recipient(self, notification):
+        return notification.notify_kwargs.get("unionid")
+
     def make_content(
         self, title, content, recipients, recipient_field, **kwargs
     ) -> dict:
         return {"subject": title, "description": content, **kwargs}
 
     def get_access_token(self):
-        url = "https://oapi.dingtalk.com/gettoken"
-        params = {
-            "appkey": self.app_key,
-            "appsecret": self.app_secret,
+        return get_dingtalk_access_token(
+            self.app_key, self.app_secret, alias=self.get_setting("token_cache")
+        )
+
+    def invalidate_access_token(self):
+        invalidate_dingtalk_access_token(
+            self.app_key, alias=self.get_setting("token_cache")
+        )
+
+    def check_response(self, status_code: int, ret: dict) -> None:
+        if status_code == 401:
+            self.invalidate_access_token()
+        assert status_code == 200, ret["message"]
+
+    def handle_result(self, message: Message, recipient, unionid, exc, save):
+        notify_kwargs = {
+            "unionid": unionid,
+            "executorIds": [unionid],
         }
-        resp = requests.get(url, params=params)
-        ret = resp.json()
-        return ret["access_token"]
+        if exc is not None:
+            self.on_failure(message, recipient, exc, save, notify_kwargs)
+        else:
+            self.on_success(message, recipient, save, notify_kwargs)
 
     def perform_send(
         self, message: Message, recipients, recipient_field, save, **kwargs
@@ -67,24 +92,54 @@ class DingTalkToDoTaskNotificationBackend(BaseNotificationBackend):
         Send dingtalk work message
         For details, see: https://open.dingtalk.com/document/isvapp-server/asynchronous-sending-of-enterprise-session-messages
         """  # noqa
-        url = "https://api.dingtalk.com/v1.0/todo/users/{unionid}/tasks"
         headers = {"x-acs-dingtalk-access-token": self.get_access_token()}
-        for recipient in recipients:
-            dingtalk_unionid = self.get_recipient(recipient, recipient_field)
-            notify_kwargs = {
-                "unionid": dingtalk_unionid,
-                "executorIds": [dingtalk_unionid],
-            }
-            url = url.format(unionid=dingtalk_unionid)
-            json = {"executorIds": [dingtalk_unionid], **message.content}
-            try:
-                resp = requests.post(url, headers=headers, json=json)
-                ret = resp.json()
-                assert resp.status_code == 200, ret["message"]
-            except Exception as e:
-                self.on_failure(message, recipient, e, save, notify_kwargs)
-            else:
-                self.on_success(message, recipient, save, notify_kwargs)
+        items = (
+            (recipient, self.get_recipient(recipient, recipient_field))
+            for recipient in recipients
+        )
+
+        def create_task(item):
+            unionid = item[1]
+            json = {"executorIds": [unionid], **message.content}
+            resp = get_session().post(
+                self.send_url.format(unionid=unionid), headers=headers, json=json
+            )
+            self.check_response(resp.status_code, resp.json())
+
+        for (recipient, unionid), _, exc in self.dispatch(create_task, items):
+            self.handle_result(message, recipient, unionid, exc, save)
+
+    async def async_perform_send(
+        self, message: Message, recipients, recipient_field, save, **kwargs
+    ) -> None:
+        """
+        Create dingtalk todo tasks with httpx if it is installed
+        """
+        client = await get_async_client()
+        if client is None:
+            return await super().async_perform_send(
+                message, recipients, recipient_field, save, **kwargs
+            )
+
+        access_token = await sync_to_async(self.get_access_token)()
+        headers = {"x-acs-dingtalk-access-token": access_token}
+        items = (
+            (recipient, self.get_recipient(recipient, recipient_field))
+            for recipient in recipients
+        )
+
+        async def create_task(item):
+            unionid = item[1]
+            json = {"executorIds": [unionid], **message.content}
+            resp = await client.post(
+                self.send_url.format(unionid=unionid), headers=headers, json=json
+            )
+            self.check_response(resp.status_code, resp.json())
+
+        async for (recipient, unionid), _, exc in self.async_dispatch(
+            create_task, items
+        ):
+            self.handle_result(message, recipient, unionid, exc, save)
 
 
 def notify_by_dingtalk_todotask(
@@ -1,6 +1,7 @@
+import logging
 import typing
 
-import requests
+from asgiref.sync import sync_to_async
 from django.conf import settings
 from django.contrib.auth.models import User
 from django.core.exceptions import ImproperlyConfigured
@@ -8,7 +9,19 @@ from django.template import Context, Template
 from markdownify import markdownify
 
 from notification.base import BaseNotificationBackend, notify
-from notification.models import Message, MessageTemplate
+from notification.http import get_async_client, get_session
+from notification.models import Message
+from notification.tokens import (
+    DINGTALK_INVALID_TOKEN_ERRCODES,
+    get_dingtalk_access_token,
+    invalidate_dingtalk_access_token,
+)
+from notification.utils import chunked
+
+logger = logging.getLogger(__name__)
+
+# `asyncsend_v2` accepts at most 100 users per request
+MAX_USERID_BATCH_SIZE = 100
 
 
 class DingTalkWorkMessageNotificationBackend(BaseNotificationBackend):
@@ -18,9 +31,19 @@ class DingTalkWorkMessageNotificationBackend(BaseNotificationBackend):
     """  # noqa
 
     id = "dingtalkworkmessage"
+    recipient_fields = ()
     message_subtype = "markdown"
-
-    def __init__(self, *args, agent_id=None, app_key=None, app_secret=None, **kwargs):
+    send_url = "https://oapi.dingtalk.com/topapi/message/corpconversation/asyncsend_v2"
+
+    def __init__(
+        self,
+        *args,
+        agent_id=None,
+        app_key=None,
+        app_secret=None,
+        batch_send=None,
+        **kwargs,
+    ):
         try:
             self.notification_settting = settings.DJANGO_USER_NOTIFICATION[self.id]
         except (AttributeError, KeyError):
@@ -53,59 +76,125 @@ class DingTalkWorkMessageNotificationBackend(BaseNotificationBackend):
                 "settings.DJANGO_USER_NOTIFICATION[{}]".format(self.id)
             )
 
+        if batch_send is None:
+            batch_send = self.notification_settting.get("batch_send", False)
+        self.batch_send = batch_send
+        self.userid_batch_size = min(
+            self.notification_settting.get("userid_batch_size", MAX_USERID_BATCH_SIZE),
+            MAX_USERID_BATCH_SIZE,
+        )
+
         super().__init__(*args, **kwargs)
 
-    def render_template(self, template: MessageTemplate, context: dict) -> str:
+    def render_compiled_template(
+        self, compiled_template: Template, context: dict
+    ) -> str:
         try:
-            html_content = Template(template.content).render(Context(context))
+            html_content = compiled_template.render(Context(context))
             return markdownify(html_content)
         except Exception as e:
             raise ValueError("Render message failed: %s" % e)
 
+    def get_notification_recipient(self, notification):
+        return notification.notify_kwargs.get("userid_list")
+
     def make_content(
         self, title, content, recipients, recipient_field, **kwargs
     ) -> dict:
         return {
             "msgtype": self.message_subtype,
-            self.msgtype: {"title": title, "text": content},
+            self.message_subtype: {"title": title, "text": content},
         }
 
     def get_access_token(self):
-        url = "https://oapi.dingtalk.com/gettoken"
-        params = {
-            "appkey": self.app_key,
-            "appsecret": self.app_secret,
+        return get_dingtalk_access_token(
+            self.app_key, self.app_secret, alias=self.get_setting("token_cache")
+        )
+
+    def invalidate_access_token(self):
+        invalidate_dingtalk_access_token(
+            self.app_key, alias=self.get_setting("token_cache")
+        )
+
+    def get_batches(self, recipients, recipient_field):
+        """
+        Split recipients into batches of (recipient, userid) pairs
+        """
+        batch_size = self.userid_batch_size if self.batch_send else 1
+        for batch in chunked(recipients, batch_size):
+            yield [
+                (recipient, self.get_recipient(recipient, recipient_field))
+                for recipient in batch
+            ]
+
+    def make_request_json(self, message: Message, batch, **kwargs) -> dict:
+        return {
+            "agent_id": self.agent_id,
+            "msg": message.content,
+            "userid_list": ",".join(str(userid) for _, userid in batch),
+            **kwargs,
         }
-        resp = requests.get(url, params=params)
-        ret = resp.json()
-        return ret["access_token"]
+
+    def get_task_id(self, ret: dict):
+        if ret["errcode"] in DINGTALK_INVALID_TOKEN_ERRCODES:
+            self.invalidate_access_token()
+        assert ret["errcode"] == 0, ret["errmsg"]
+        return ret.get("task_id")
+
+    def handle_batch_result(self, message: Message, batch, task_id, exc, save):
+        if exc is not None:
+            if len(batch) > 1:
+                logger.error("Failed to send message to %s users: %s", len(batch), exc)
+            for recipient, userid in batch:
+                notify_kwargs = {"userid_list": userid}
+                self.on_failure(message, recipient, exc, save, notify_kwargs)
+        else:
+            for recipient, userid in batch:
+                notify_kwargs = {"userid_list": userid, "task_id": task_id}
+                self.on_success(message, recipient, save, notify_kwargs)
 
     def perform_send(
         self, message: Message, recipients, recipient_field, save, **kwargs
     ) -> None:
         """
-        Send dingtalk work message
+        Send dingtalk work message, with `batch_send` enabled recipients are sent
+        in chunks of `userid_batch_size` users per request.
         """
-        url = "https://oapi.dingtalk.com/topapi/message/corpconversation/asyncsend_v2"
         params = {"access_token": self.get_access_token()}
-        for recipient in recipients:
-            dingtalk_userid = self.get_recipient(recipient, recipient_field)
-            notify_kwargs = {"userid_list": dingtalk_userid}
-            json = {
-                "agent_id": self.agent_id,
-                "msg": message.content,
-                **notify_kwargs,
-                **kwargs,
-            }
-            try:
-                resp = requests.post(url, params=params, json=json)
-                resp.raise_for_status()
-                ret = resp.json()
-                assert ret["errcode"] == 0, ret["errmsg"]
-            except Exception as e:
-                self.on_failure(message, recipient, e, save, notify_kwargs)
-            else:
-                self.on_success(message, recipient, save, notify_kwargs)
+
+        def send_batch(batch):
+            json = self.make_request_json(message, batch, **kwargs)
+            resp = get_session().post(self.send_url, params=params, json=json)
+            resp.raise_for_status()
+            return self.get_task_id(resp.json())
+
+        batches = self.get_batches(recipients, recipient_field)
+        for batch, task_id, exc in self.dispatch(send_batch, batches):
+            self.handle_batch_result(message, batch, task_id, exc, save)
+
+    async def async_perform_send(
+        self, message: Message, recipients, recipient_field, save, **kwargs
+    ) -> None:
+        """
+        Send dingtalk work message with httpx if it is installed
+        """
+        client = await get_async_client()
+        if client is None:
+            return await super().async_perform_send(
+                message, recipients, recipient_field, save, **kwargs
+            )
+
+        params = {"access_token": await sync_to_async(self.get_access_token)()}
+
+        async def send_batch(batch):
+            json = self.make_request_json(message, batch, **kwargs)
+            resp = await client.post(self.send_url, params=params, json=json)
+            resp.raise_for_status()
+            return self.get_task_id(resp.json())
+
+        batches = self.get_batches(recipients, recipient_field)
+        async for batch, task_id, exc in self.async_dispatch(send_batch, batches):
+            self.handle_batch_result(message, batch, task_id, exc, save)
 
 
 def notify_by_dingtalk_workmessage(
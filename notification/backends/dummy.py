@@ -10,6 +10,7 @@ class DummyNotificationBackend(BaseNotificationBackend):
     """
 
     id = "dummy"
+    recipient_fields = ()
 
     def make_content(self, title, content, recipients, recipient_field, **kwargs):
         return content
@@ -1,12 +1,18 @@
+import base64
+import math
 import typing
 from email.mime.base import MIMEBase
+from smtplib import SMTPServerDisconnected
 
 from django.contrib.auth.models import User
-from django.core.mail import EmailMessage
+from django.core.mail import EmailMessage, get_connection
 from django.template import Context, Template
 
 from notification.base import BaseNotificationBackend, notify
-from notification.models import Message, MessageTemplate
+from notification.models import Message
+from notification.utils import chunked
+
+DEFAULT_CONNECTION_BATCH_SIZE = 100
 
 
 class EmailNotificationBackend(BaseNotificationBackend):
@@ -15,39 +21,138 @@ class EmailNotificationBackend(BaseNotificationBackend):
     """
 
     id = "email"
+    recipient_fields = ()
     message_subtype = "html"
 
-    def render_template(self, template: MessageTemplate, context: dict) -> str:
+    def __init__(self, *args, connection_batch_size=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.connection_batch_size = connection_batch_size or self.get_setting(
+            "connection_batch_size", DEFAULT_CONNECTION_BATCH_SIZE
+        )
+
+    def render_compiled_template(
+        self, compiled_template: Template, context: dict
+    ) -> str:
         try:
-            return Template(template.content).render(Context(context))
+            return compiled_template.render(Context(context))
         except Exception as e:
             raise ValueError("Render message failed: %s" % e)
 
-    def make_content(self, title, content, recipients, recipient_field, **kwargs):
+    def get_notification_recipient(self, notification):
+        return (notification.notify_kwargs.get("to") or [None])[0]
+
+    def dump_attachment(self, attachment) -> list:
+        """
+        Return attachment, a MIMEBase or a (filename, content, mimetype) tuple,
+        as a JSON serializable [filename, base64 content, mimetype] list
+        """
+        if isinstance(attachment, MIMEBase):
+            filename = attachment.get_filename()
+            content = attachment.get_payload(decode=True) or b""
+            mimetype = attachment.get_content_type()
+        else:
+            filename, content, mimetype = attachment
+        if isinstance(content, str):
+            content = content.encode("utf-8")
+        return [filename, base64.b64encode(content).decode("ascii"), mimetype]
+
+    def load_attachment(self, attachment: list) -> tuple:
+        filename, content, mimetype = attachment
+        return filename, base64.b64decode(content), mimetype
+
+    def make_content(
+        self, title, content, recipients, recipient_field, attachments=None, **kwargs
+    ):
         return {
             "subject": title,
             "body": content,
+            "attachments": [self.dump_attachment(a) for a in attachments or ()],
             **kwargs,
         }
 
+    def make_email(self, message: Message, notify_kwargs: dict, connection):
+        content = dict(message.content)
+        content["attachments"] = [
+            self.load_attachment(a) for a in content.get("attachments") or ()
+        ]
+        email = EmailMessage(**notify_kwargs, **content, connection=connection)
+        email.content_subtype = self.message_subtype
+        return email
+
+    def send_email(self, connection, email: EmailMessage) -> None:
+        """
+        Send email over connection, reconnect once if the server went away
+        """
+        try:
+            connection.open()
+            connection.send_messages([email])
+        except (SMTPServerDisconnected, ConnectionError):
+            connection.close()
+            connection.open()
+            connection.send_messages([email])
+
     def perform_send(
         self, message: Message, recipients, recipient_field, save, **kwargs
     ):
         """
         For details, see: ...
         """
-        email_content = message.content
-        for recipient in recipients:
-            recipient_email = self.get_recipient(recipient, recipient_field)
-            notify_kwargs = {"to": [recipient_email]}
-            email = EmailMessage(**notify_kwargs, **email_content)
-            email.content_subtype = self.message_subtype
-            try:
-                email.send()
-            except Exception as e:
-                self.on_failure(message, recipient, e, save, notify_kwargs)
-            else:
-                self.on_success(message, recipient, save, notify_kwargs)
+        self.perform_send_many(
+            ((message, recipient) for recipient in recipients),
+            recipient_field,
+            save,
+            **kwargs,
+        )
+
+    def perform_send_many(self, batch, recipient_field, save, **kwargs) -> None:
+        """
+        Send emails of (message, recipient) pairs, reusing one smtp connection
+        for every `connection_batch_size` emails. The batch is split between
+        `max_workers` connections at least.
+        """
+        batch = list(batch)
+        size = min(self.connection_batch_size, math.ceil(len(batch) / self.max_workers))
+        chunks = (
+            [
+                (
+                    message,
+                    recipient,
+                    {"to": [self.get_recipient(recipient, recipient_field)]},
+                )
+                for message, recipient in chunk
+            ]
+            for chunk in chunked(batch, max(size, 1))
+        )
+        for _, results, exc in self.dispatch(self.send_chunk, chunks, throttle=False):
+            if exc is not None:
+                raise exc
+
+            for message, recipient, notify_kwargs, error in results:
+                if error is not None:
+                    self.on_failure(message, recipient, error, save, notify_kwargs)
+                else:
+                    self.on_success(message, recipient, save, notify_kwargs)
+
+    def send_chunk(self, chunk) -> list:
+        """
+        Send emails of chunk over one connection, return the error of each email.
+        Each email takes one request from the rate limit.
+        """
+        results = []
+        connection = get_connection()
+        try:
+            for message, recipient, notify_kwargs in chunk:
+                self.throttle()
+                try:
+                    email = self.make_email(message, notify_kwargs, connection)
+                    self.send_email(connection, email)
+                except Exception as e:
+                    results.append((message, recipient, notify_kwargs, e))
+                else:
+                    results.append((message, recipient, notify_kwargs, None))
+        finally:
+            connection.close()
+        return results
 
 
 def notify_by_email(
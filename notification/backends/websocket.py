@@ -1,3 +1,5 @@
+import itertools
+
 from asgiref.sync import async_to_sync
 from django.contrib.auth.models import User
 
@@ -14,11 +16,18 @@ except ImportError:
 class WebsocketNotificationBackend(BaseNotificationBackend):
     """
     A backend handle websocket message.
-
+    Besides the group of each recipient, messages can be sent to `groups`, e.g.
+    segment groups joined by `NotificationConsumer`, with one `group_send` each.
     """
 
     id = "websocket"
+    recipient_fields = ()
     message_subtype = "plain"
+    default_max_workers = 100
+
+    def __init__(self, *args, groups: list[str] = None, **kwargs):
+        self.groups = groups or []
+        super().__init__(*args, **kwargs)
 
     def make_content(
         self,
@@ -37,47 +46,93 @@ class WebsocketNotificationBackend(BaseNotificationBackend):
             **kwargs,
         }
 
+    def send_chunks(self, message, chunks, recipient_field, save, **kwargs) -> None:
+        """
+        Send to chunks of recipients, then to `groups` once, all in one event
+        loop entry
+        """
+        async_to_sync(self.async_send_chunks)(
+            message, chunks, recipient_field, save, **kwargs
+        )
+
+    async def async_send_chunks(
+        self, message, chunks, recipient_field, save, **kwargs
+    ) -> None:
+        """
+        Async version of `send_chunks`
+        """
+        await super().async_send_chunks(message, chunks, recipient_field, save, **kwargs)
+        if self.groups:
+            await self.async_perform_send(
+                message, [], recipient_field, save, groups=self.groups, **kwargs
+            )
+
     def perform_send(
         self,
         message: Message,
         recipients: list[User],
         recipient_field,
         save,
+        groups: list[str] = (),
+        **kwargs,
+    ):
+        """
+        Send to the groups of recipients in one event loop entry
+        """
+        async_to_sync(self.async_perform_send)(
+            message, recipients, recipient_field, save, groups=groups, **kwargs
+        )
+
+    async def async_perform_send(
+        self,
+        message: Message,
+        recipients: list[User],
+        recipient_field,
+        save,
+        groups: list[str] = (),
         **kwargs,
     ):
         """
-        For details, see: https://ding-doc.dingtalk.com/doc#/serverapi2/qf2nxq
+        Send to the groups of recipients and `groups` concurrently, up to
+        `max_workers` group sends at a time.
         """
         channel_layer = channels.layers.get_channel_layer()
-        for recipient in recipients:
-            notify_kwargs = {"group_name": get_group_name(recipient.pk)}
-            try:
-                async_to_sync(channel_layer.group_send)(
-                    notify_kwargs["group_name"], message.content
-                )
-            except Exception as e:
-                self.on_failure(message, recipient, e, save, notify_kwargs)
+        items = itertools.chain(
+            ((recipient, get_group_name(recipient.pk)) for recipient in recipients),
+            ((None, group_name) for group_name in groups),
+        )
+
+        async def group_send(item):
+            await channel_layer.group_send(item[1], message.content)
+
+        async for (recipient, group_name), _, exc in self.async_dispatch(
+            group_send, items
+        ):
+            notify_kwargs = {"group_name": group_name}
+            if exc is not None:
+                self.on_failure(message, recipient, exc, save, notify_kwargs)
             else:
                 self.on_success(message, recipient, save, notify_kwargs)
 
 
 def notify_by_websocket(
-    recipients: list[User],
+    recipients: list[User] = None,
     title: str = None,
     message: str = None,
     context: dict = None,
     template_code: str = None,
     msgtype="notify",
     save: bool = False,
+    groups: list[str] = None,
     **kwargs,
 ):
     """
-    Shortcut for websocket notification
+    Shortcut for websocket notification, `groups` are extra group names to send to
     """
     message_kwargs = {"msgtype": msgtype}
 
     return notify(
-        recipients,
+        recipients or [],
         title=title,
         message=message,
         context=context,
@@ -85,5 +140,6 @@ def notify_by_websocket(
         backends=(WebsocketNotificationBackend,),
         save=save,
         message_kwargs=message_kwargs,
+        groups=groups,
         **kwargs,
     )
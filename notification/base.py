@@ -1,27 +1,213 @@
+import asyncio
 import logging
 import typing
+from collections import Counter, deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 
+from asgiref.sync import sync_to_async
 from django.contrib.auth.models import User
-from django.core.exceptions import ObjectDoesNotExist
+from django.core.exceptions import FieldDoesNotExist
+from django.db import transaction
+from django.db.models import QuerySet
 from django.template import Context, Template
+from django.utils import timezone
 from markdownify import markdownify
 from django.utils.module_loading import import_string
 
+from notification.cache import get_compiled_template, get_message_template
+from notification.counters import incr_unread_counts
 from notification.models import Message, MessageTemplate, Notification
+from notification.pool import backend_pool
+from notification.ratelimit import get_rate_limiter
+from notification.retention import delete_in_batches
+from notification.utils import (
+    Recipient,
+    chunked,
+    get_backoff,
+    get_notification_settings,
+)
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_SAVE_BATCH_SIZE = 1000
+DEFAULT_SEND_BATCH_SIZE = 100
+DEFAULT_MAX_WORKERS = 1
+
+
+# Backend classes by id, filled when they are defined
+backend_registry = {}
+
 
 class BaseNotificationBackend:
     id = None
     message_subtype = "plain"
     message_class = Message
     notification_class = Notification
+    executor_class = ThreadPoolExecutor
+    default_max_workers = DEFAULT_MAX_WORKERS
+    # Backends using all recipients in `make_content` set it to False
+    streaming = True
+    # Fields of recipients used by backend besides `recipient_field`. Backend
+    # classes declaring it get `Recipient` records of a queryset instead of user
+    # instances, it isn't inherited.
+    recipient_fields = None
 
-    def __init__(self, fail_silently: bool = False, **kwargs) -> None:
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # Subclasses inheriting id don't take the place of their parent
+        if cls.__dict__.get("id"):
+            backend_registry[cls.id] = cls
+
+    def __init__(
+        self,
+        fail_silently: bool = False,
+        save_batch_size: int = None,
+        send_batch_size: int = None,
+        max_workers: int = None,
+        **kwargs,
+    ) -> None:
         self.fail_silently = fail_silently
+        self.save_batch_size = save_batch_size or self.get_setting(
+            "save_batch_size", DEFAULT_SAVE_BATCH_SIZE
+        )
+        self.send_batch_size = send_batch_size or self.get_setting(
+            "send_batch_size", DEFAULT_SEND_BATCH_SIZE
+        )
+        self.max_workers = max_workers or self.get_setting(
+            "max_workers", self.default_max_workers
+        )
+        self._pending_messages = {}
+        self._pending_notifications = []
+        self._retrying_notifications = {}
+        self._pending_updates = []
+        self._failures = None
+        self._save_failures = True
+        self._executor = None
+
+    def get_setting(self, name: str, default=None):
+        """
+        Get backend option from ``settings.DJANGO_USER_NOTIFICATION[id]``
+        """
+        return get_notification_settings(self.id).get(name, default)
+
+    def throttle(self) -> None:
+        """
+        Wait until the `rate_limit` of backend allows one more request
+        """
+        limiter = get_rate_limiter(self.id)
+        if limiter is not None:
+            limiter.wait()
+
+    async def async_throttle(self) -> None:
+        """
+        Async version of `throttle`
+        """
+        limiter = get_rate_limiter(self.id)
+        if limiter is not None:
+            await limiter.async_wait()
+
+    def dispatch(
+        self, func: typing.Callable, items: typing.Iterable, throttle: bool = True
+    ):
+        """
+        Call `func` with each item, in up to `max_workers` threads of
+        `executor_class`, and yield (item, result, exception) in the order of items.
+        Pass `throttle=False` if `func` throttles its own requests.
+        """
+        if self.max_workers <= 1:
+            for item in items:
+                if throttle:
+                    self.throttle()
+                try:
+                    yield item, func(item), None
+                except Exception as e:
+                    yield item, None, e
+            return
+
+        pending = deque()
+        executor = self.get_executor()
+        try:
+            for item in items:
+                if throttle:
+                    self.throttle()
+                pending.append((item, executor.submit(func, item)))
+                # Bound the number of in-flight items
+                if len(pending) >= self.max_workers * 2:
+                    yield self._get_dispatch_result(*pending.popleft())
+
+            while pending:
+                yield self._get_dispatch_result(*pending.popleft())
+        finally:
+            for _, future in pending:
+                future.cancel()
+
+    def get_executor(self):
+        """
+        Get the executor of backend, its threads are reused by every `dispatch`
+        until `close`
+        """
+        if self._executor is None:
+            self._executor = self.executor_class(max_workers=self.max_workers)
+        return self._executor
+
+    def close(self) -> None:
+        """
+        Shut down the executor of backend
+        """
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def _get_dispatch_result(self, item, future):
+        try:
+            return item, future.result(), None
+        except Exception as e:
+            return item, None, e
+
+    async def async_dispatch(self, func: typing.Callable, items: typing.Iterable):
+        """
+        Await coroutine function `func` with each item, up to `max_workers` at a
+        time, and yield (item, result, exception) in the order of items.
+        """
+        pending = deque()
+        try:
+            for item in items:
+                await self.async_throttle()
+                pending.append((item, asyncio.ensure_future(func(item))))
+                if len(pending) >= self.max_workers:
+                    yield await self._get_async_dispatch_result(*pending.popleft())
+
+            while pending:
+                yield await self._get_async_dispatch_result(*pending.popleft())
+        finally:
+            for _, task in pending:
+                task.cancel()
+
+    async def _get_async_dispatch_result(self, item, task):
+        try:
+            return item, await task, None
+        except Exception as e:
+            return item, None, e
+
+    @contextmanager
+    def collect_failures(self, save: bool = True):
+        """
+        Collect (recipient, exception) of deliveries failed in the block into
+        the yielded list. With `save=False`, their notifications aren't saved.
+        """
+        failures = []
+        self._failures, self._save_failures = failures, save
+        try:
+            yield failures
+        finally:
+            self._failures, self._save_failures = None, True
 
     def on_failure(self, message, recipient, exc, save=False, notify_kwargs=None):
+        if self._failures is not None:
+            self._failures.append((recipient, exc))
+            save = save and self._save_failures
+
         if not self.fail_silently:
             raise exc
 
@@ -31,38 +217,103 @@ class BaseNotificationBackend:
             exc,
         )
         if save:
-            if message.pk is None:
-                message.save()
-
-            if recipient is None:
-                return
-
-            self.notification_class.objects.create(
-                to=recipient,
-                message=message,
-                notify_kwargs=notify_kwargs or {},
-                is_sent=False,
-            )
+            self.add_notification(message, recipient, notify_kwargs, is_sent=False)
 
     def on_success(self, message, recipient, save=False, notify_kwargs=None):
         logger.debug("Successfully send message to recipient: %s", recipient)
         if save:
-            if message.pk is None:
-                message.save()
+            self.add_notification(message, recipient, notify_kwargs, is_sent=True)
 
-            if recipient is None:
-                return
+    def add_notification(
+        self, message, recipient, notify_kwargs=None, is_sent=False
+    ) -> None:
+        """
+        Buffer a notification of message to recipient, it will be saved on `flush`.
+        It doesn't touch the database, so it is safe to call in async code.
+        """
+        if message.pk is None:
+            self._pending_messages[id(message)] = message
 
-            self.notification_class.objects.create(
-                to=recipient,
-                message=message,
-                notify_kwargs=notify_kwargs or {},
-                is_sent=True,
-            )
+        if recipient is None:
+            return
+
+        retrying = self._retrying_notifications.get((message.pk, recipient.pk))
+        if retrying is not None:
+            retrying.is_sent = is_sent
+            retrying.notify_kwargs = notify_kwargs or retrying.notify_kwargs
+            self._pending_updates.append(retrying)
+            return
+
+        notification = self.notification_class(
+            to_id=recipient.pk,
+            message=message,
+            notify_kwargs=notify_kwargs or {},
+            is_sent=is_sent,
+        )
+        if not is_sent:
+            notification.attempts = 1
+            notification.next_attempt_at = timezone.now() + get_backoff(1)
+        self._pending_notifications.append(notification)
+
+    def is_idle(self) -> bool:
+        """
+        Whether nothing is buffered, so the backend can be reused
+        """
+        return not (
+            self._pending_messages
+            or self._pending_notifications
+            or self._pending_updates
+            or self._retrying_notifications
+        )
+
+    def flush(self) -> None:
+        """
+        Save buffered messages and notifications, one transaction per
+        `save_batch_size` notifications.
+        """
+        messages = [m for m in self._pending_messages.values() if m.pk is None]
+        notifications = self._pending_notifications
+        updates = self._pending_updates
+        self._pending_messages = {}
+        self._pending_notifications = []
+        self._pending_updates = []
+        # Messages are saved with the first batch of notifications, so their rows
+        # locked by `save_messages` can't be purged before they are used
+        batches = list(chunked(notifications, self.save_batch_size))
+        if messages and not batches:
+            batches = [[]]
+        for i, batch in enumerate(batches):
+            with transaction.atomic():
+                if i == 0 and messages:
+                    self.save_messages(messages)
+                self.notification_class.objects.bulk_create(batch)
+                incr_unread_counts(Counter(n.to_id for n in batch))
+
+        now = timezone.now()
+        for notification in updates:
+            notification.updated_at = now
+        for batch in chunked(updates, self.save_batch_size):
+            with transaction.atomic():
+                self.notification_class.objects.bulk_update(
+                    batch, ["is_sent", "notify_kwargs", "updated_at"]
+                )
+
+    def save_messages(self, messages: list[Message]) -> None:
+        """
+        Save messages, identical messages share one row
+        """
+        self.message_class.objects.get_or_create_many(
+            messages, batch_size=self.save_batch_size
+        )
 
     def render_template(self, template: MessageTemplate, context: dict) -> str:
+        return self.render_compiled_template(get_compiled_template(template), context)
+
+    def render_compiled_template(
+        self, compiled_template: Template, context: dict
+    ) -> str:
         try:
-            html_content = Template(template.content).render(Context(context))
+            html_content = compiled_template.render(Context(context))
             return markdownify(html_content).strip()
         except Exception as e:
             raise ValueError("Render message failed: %s" % e)
@@ -85,12 +336,156 @@ class BaseNotificationBackend:
     def perform_send(self, message, recipients, recipient_field, save, **kwargs) -> None:
         raise NotImplementedError
 
-    def clear(self) -> None:
+    async def async_perform_send(
+        self, message, recipients, recipient_field, save, **kwargs
+    ) -> None:
+        """
+        Async version of `perform_send`, runs `perform_send` in a thread by default.
+        """
+        await sync_to_async(self.perform_send)(
+            message, recipients, recipient_field, save=save, **kwargs
+        )
+
+    def perform_send_many(self, batch, recipient_field, save, **kwargs) -> None:
+        """
+        Send a batch of (message, recipient) pairs
+        """
+        for message, recipient in batch:
+            self.perform_send(message, [recipient], recipient_field, save=save, **kwargs)
+
+    def get_notification_recipient(self, notification: Notification):
+        """
+        Get the recipient address a saved notification was sent to, it is used
+        to send the notification again. Backends not using `recipient_field`
+        return None.
+        """
+        return None
+
+    def retry(self, notifications: typing.Iterable[Notification]) -> None:
+        """
+        Send saved notifications again, grouped by message. Their `is_sent`
+        and `notify_kwargs` are updated instead of saving new notifications.
+        """
+        groups = {}
+        for notification in notifications:
+            groups.setdefault(notification.message_id, []).append(notification)
+
+        try:
+            for group in groups.values():
+                message = group[0].message
+                addresses = {n.to_id: self.get_notification_recipient(n) for n in group}
+                self._retrying_notifications = {(message.pk, n.to_id): n for n in group}
+                self.perform_send(
+                    message,
+                    [n.to for n in group],
+                    lambda recipient: addresses[recipient.pk],
+                    save=True,
+                )
+                self.flush()
+        finally:
+            self._retrying_notifications = {}
+            self.flush()
+
+    def clear(self, batch_size: int = None) -> None:
         """
-        Clear notification
+        Clear notification, `batch_size` rows per transaction
         """
-        self.notification_class.objects.filter(message__msg_type=self.id).delete()
-        self.message_class.objects.filter(msg_type=self.id).delete()
+        batch_size = batch_size or self.save_batch_size
+        delete_in_batches(
+            self.notification_class.objects.filter(message__msg_type=self.id),
+            batch_size,
+        )
+        delete_in_batches(
+            self.message_class.objects.filter(msg_type=self.id), batch_size
+        )
+
+    @classmethod
+    def projects_recipients(cls) -> bool:
+        """
+        Whether recipients may be loaded as `Recipient` records. Only classes
+        declaring `recipient_fields` themselves opt in, subclasses of them get
+        user instances unless they declare it too.
+        """
+        return cls.__dict__.get("recipient_fields") is not None
+
+    def get_recipient_fields(self, model, recipient_field) -> typing.Optional[list]:
+        """
+        Get field names to load of recipients, None if model instances
+        are needed, e.g. by a callable `recipient_field`.
+        """
+        if not self.projects_recipients():
+            return None
+
+        fields = list(self.recipient_fields)
+        if recipient_field is not None:
+            if callable(recipient_field):
+                return None
+            fields.append(recipient_field)
+
+        for name in fields:
+            try:
+                field = model._meta.get_field(name)
+            except FieldDoesNotExist:
+                return None
+            if not field.concrete or field.many_to_many:
+                return None
+        return fields
+
+    def get_recipient_chunks(
+        self,
+        recipients: typing.Iterable[User],
+        recipient_field: typing.Union[str, typing.Callable],
+    ) -> typing.Iterator[list]:
+        """
+        Split recipients into lists of `send_batch_size`. A queryset is streamed,
+        as `Recipient` records of pk and the fields backend needs when possible.
+        Yield one empty list if there is no recipient.
+        """
+        if isinstance(recipients, QuerySet):
+            fields = self.get_recipient_fields(recipients.model, recipient_field)
+            if fields is None:
+                recipients = recipients.iterator(chunk_size=self.send_batch_size)
+            else:
+                rows = recipients.values_list(
+                    recipients.model._meta.pk.name, *fields
+                ).iterator(chunk_size=self.send_batch_size)
+                recipients = (
+                    Recipient(row[0], **dict(zip(fields, row[1:]))) for row in rows
+                )
+
+        empty = True
+        for chunk in chunked(recipients or (), self.send_batch_size):
+            empty = False
+            yield chunk
+
+        if empty:
+            yield []
+
+    def send_chunks(self, message, chunks, recipient_field, save, **kwargs) -> None:
+        """
+        Send message to chunks of recipients, saving notifications of each chunk
+        """
+        for chunk in chunks:
+            self.perform_send(message, chunk, recipient_field, save=save, **kwargs)
+            self.flush()
+
+    async def async_send_chunks(
+        self, message, chunks, recipient_field, save, **kwargs
+    ) -> None:
+        """
+        Async version of `send_chunks`, chunks are fetched in a thread
+        """
+        chunks = iter(chunks)
+        get_chunk = sync_to_async(next)
+        while True:
+            chunk = await get_chunk(chunks, None)
+            if chunk is None:
+                return
+
+            await self.async_perform_send(
+                message, chunk, recipient_field, save=save, **kwargs
+            )
+            await sync_to_async(self.flush)()
 
     def send_with_template(
         self,
@@ -111,7 +506,7 @@ class BaseNotificationBackend:
         title = title or template.title
         message_kwargs = message_kwargs or {}
         if template.message_kwargs:
-            message_kwargs = template.message_kwargs.update(message_kwargs)
+            message_kwargs = {**template.message_kwargs, **message_kwargs}
 
         return self.send(
             title,
@@ -124,6 +519,51 @@ class BaseNotificationBackend:
             **kwargs,
         )
 
+    def send_many_with_template(
+        self,
+        items: typing.Iterable[typing.Tuple[User, dict]],
+        template: MessageTemplate,
+        title: str = None,
+        mark: str = None,
+        save: bool = False,
+        recipient_field: typing.Union[str, typing.Callable] = None,
+        message_kwargs: dict = None,
+        **kwargs,
+    ) -> None:
+        """
+        Send personalized notification to each receiver with template,
+        `items` is an iterable of (recipient, context) pairs.
+        """
+        compiled_template = get_compiled_template(template)
+        title = title or template.title
+        message_kwargs = message_kwargs or {}
+        if template.message_kwargs:
+            message_kwargs = {**template.message_kwargs, **message_kwargs}
+
+        batch = []
+        try:
+            for recipient, context in items:
+                content = self.make_content(
+                    title,
+                    self.render_compiled_template(compiled_template, context),
+                    [recipient],
+                    recipient_field,
+                    **message_kwargs,
+                )
+                message = self.message_class(
+                    title=title, content=content, mark=mark, msg_type=self.id
+                )
+                batch.append((message, recipient))
+                if len(batch) >= self.send_batch_size:
+                    self.perform_send_many(batch, recipient_field, save=save, **kwargs)
+                    self.flush()
+                    batch = []
+
+            if batch:
+                self.perform_send_many(batch, recipient_field, save=save, **kwargs)
+        finally:
+            self.flush()
+
     def send(
         self,
         title: str,
@@ -136,8 +576,13 @@ class BaseNotificationBackend:
         **kwargs,
     ) -> None:
         """
-        Send notification to receivers
+        Send notification to receivers, `recipients` can be a queryset or
+        an iterator, they are sent in chunks of `send_batch_size`.
         """
+        chunks = self.get_recipient_chunks(recipients, recipient_field)
+        if not self.streaming:
+            recipients = [recipient for chunk in chunks for recipient in chunk]
+            chunks = [recipients]
 
         message_content = self.make_content(
             title, content, recipients, recipient_field, **(message_kwargs or {})
@@ -145,7 +590,94 @@ class BaseNotificationBackend:
         message = self.message_class(
             title=title, content=message_content, mark=mark, msg_type=self.id
         )
-        self.perform_send(message, recipients, recipient_field, save=save, **kwargs)
+        try:
+            self.send_chunks(message, chunks, recipient_field, save=save, **kwargs)
+        finally:
+            self.flush()
+
+    async def async_send_with_template(
+        self,
+        recipients: list[User],
+        template: MessageTemplate,
+        context: dict,
+        title: str = None,
+        mark: str = None,
+        save: bool = False,
+        recipient_field: typing.Union[str, typing.Callable] = None,
+        message_kwargs: dict = None,
+        **kwargs,
+    ) -> None:
+        """
+        Async version of `send_with_template`
+        """
+        rendered_content = self.render_template(template, context)
+        title = title or template.title
+        message_kwargs = message_kwargs or {}
+        if template.message_kwargs:
+            message_kwargs = {**template.message_kwargs, **message_kwargs}
+
+        return await self.async_send(
+            title,
+            recipients,
+            rendered_content,
+            mark=mark,
+            save=save,
+            recipient_field=recipient_field,
+            message_kwargs=message_kwargs,
+            **kwargs,
+        )
+
+    async def async_send(
+        self,
+        title: str,
+        recipients: list[User],
+        content: str,
+        mark: str = None,
+        save: bool = False,
+        recipient_field: typing.Union[str, typing.Callable] = None,
+        message_kwargs: dict = None,
+        **kwargs,
+    ) -> None:
+        """
+        Async version of `send`
+        """
+        chunks = self.get_recipient_chunks(recipients, recipient_field)
+        if not self.streaming:
+            recipients = await sync_to_async(
+                lambda: [recipient for chunk in chunks for recipient in chunk]
+            )()
+            chunks = [recipients]
+
+        message_content = self.make_content(
+            title, content, recipients, recipient_field, **(message_kwargs or {})
+        )
+        message = self.message_class(
+            title=title, content=message_content, mark=mark, msg_type=self.id
+        )
+        try:
+            await self.async_send_chunks(
+                message, chunks, recipient_field, save=save, **kwargs
+            )
+        finally:
+            await sync_to_async(self.flush)()
+
+
+def get_backends(backends, template: MessageTemplate = None, **kwargs):
+    """
+    Get backends of `notify` from the pool, `kwargs` is prior to `backend_kwargs`
+    of template. Each backend goes back to the pool when the next one is taken.
+    """
+    for backend_cls in backends:
+        if isinstance(backend_cls, str):
+            backend_cls = import_string(backend_cls)
+
+        if template and isinstance(template.backend_kwargs, dict):
+            backend_kwargs = {**template.backend_kwargs, **kwargs}
+        else:
+            backend_kwargs = kwargs
+
+        with backend_pool.get(backend_cls, **backend_kwargs) as backend:
+            yield backend
 
 
 def notify(
@@ -159,6 +691,7 @@ def notify(
     recipient_field: typing.Union[str, typing.Callable] = None,
     message_kwargs: dict = None,
     mark: dict = None,
+    outbox: bool = None,
     **kwargs,
 ):
     if message is None and not message_kwargs and not all([template_code, context]):
@@ -167,26 +700,35 @@ def notify(
     if not backends:
         raise ValueError("You must provide at least one backend.")
 
-    if not recipients and save:
+    if save and not isinstance(recipients, QuerySet) and not recipients:
         logger.warning("No recipients provided, `save=True` will be ignored.")
 
-    for backend_cls in backends:
-        if isinstance(backend_cls, str):
-            backend_cls = import_string(backend_cls)
+    if outbox is None:
+        outbox = get_notification_settings("outbox").get("enabled", False)
+    if outbox:
+        from notification.outbox import enqueue
 
-        if template_code:
-            try:
-                template = MessageTemplate.objects.get(code=template_code)
-            except ObjectDoesNotExist:
-                raise ValueError(f"Template: {template_code} doesn't exist.")
-            # `kwargs` is prior to `kwargs` defined in template
-            if template.backend_kwargs and isinstance(template.backend_kwargs, dict):
-                backend_kwargs = template.backend_kwargs
-                backend_kwargs.update(kwargs)
-            else:
-                backend_kwargs = kwargs
+        return enqueue(
+            recipients,
+            title=title,
+            message=message,
+            template_code=template_code,
+            context=context,
+            save=save,
+            backends=backends,
+            recipient_field=recipient_field,
+            message_kwargs=message_kwargs,
+            mark=mark,
+            **kwargs,
+        )
 
-            backend = backend_cls(**backend_kwargs)
+    if len(backends) > 1 and not isinstance(recipients, (QuerySet, list, tuple)):
+        # Each backend iterates recipients
+        recipients = list(recipients or [])
+
+    template = get_message_template(template_code) if template_code else None
+    for backend in get_backends(backends, template, **kwargs):
+        if template:
             backend.send_with_template(
                 recipients,
                 template,
@@ -198,7 +740,6 @@ def notify(
                 mark=mark,
             )
         else:
-            backend = backend_cls(**kwargs)
             backend.send(
                 title,
                 recipients,
@@ -208,3 +749,113 @@ def notify(
                 message_kwargs=message_kwargs,
                 mark=mark,
             )
+
+
+async def anotify(
+    recipients: typing.Optional[list[User]],
+    title: str = None,
+    message: str = None,
+    template_code: str = None,
+    context: dict = None,
+    save: bool = False,
+    backends: typing.Tuple[typing.Union[BaseNotificationBackend, str]] = None,
+    recipient_field: typing.Union[str, typing.Callable] = None,
+    message_kwargs: dict = None,
+    mark: dict = None,
+    outbox: bool = None,
+    **kwargs,
+):
+    """
+    Async version of `notify`
+    """
+    if message is None and not message_kwargs and not all([template_code, context]):
+        raise ValueError("You must provide message or template or message_kwargs.")
+
+    if not backends:
+        raise ValueError("You must provide at least one backend.")
+
+    if save and not isinstance(recipients, QuerySet) and not recipients:
+        logger.warning("No recipients provided, `save=True` will be ignored.")
+
+    if outbox is None:
+        outbox = get_notification_settings("outbox").get("enabled", False)
+    if outbox:
+        from notification.outbox import enqueue
+
+        return await sync_to_async(enqueue)(
+            recipients,
+            title=title,
+            message=message,
+            template_code=template_code,
+            context=context,
+            save=save,
+            backends=backends,
+            recipient_field=recipient_field,
+            message_kwargs=message_kwargs,
+            mark=mark,
+            **kwargs,
+        )
+
+    if len(backends) > 1 and not isinstance(recipients, (QuerySet, list, tuple)):
+        recipients = await sync_to_async(list)(recipients or [])
+
+    template = None
+    if template_code:
+        template = await sync_to_async(get_message_template)(template_code)
+
+    for backend in get_backends(backends, template, **kwargs):
+        if template:
+            await backend.async_send_with_template(
+                recipients,
+                template,
+                context,
+                title=title,
+                save=save,
+                recipient_field=recipient_field,
+                message_kwargs=message_kwargs,
+                mark=mark,
+            )
+        else:
+            await backend.async_send(
+                title,
+                recipients,
+                message,
+                save=save,
+                recipient_field=recipient_field,
+                message_kwargs=message_kwargs,
+                mark=mark,
+            )
+
+
+def notify_many(
+    items: typing.Iterable[typing.Tuple[User, dict]],
+    template_code: str,
+    title: str = None,
+    save: bool = False,
+    backends: typing.Tuple[typing.Union[BaseNotificationBackend, str]] = None,
+    recipient_field: typing.Union[str, typing.Callable] = None,
+    message_kwargs: dict = None,
+    mark: dict = None,
+    **kwargs,
+):
+    """
+    Send personalized notifications rendered from one template,
+    `items` is an iterable of (recipient, context) pairs.
+    """
+    if not backends:
+        raise ValueError("You must provide at least one backend.")
+
+    template = get_message_template(template_code)
+    if len(backends) > 1:
+        items = list(items)
+
+    for backend in get_backends(backends, template, **kwargs):
+        backend.send_many_with_template(
+            items,
+            template,
+            title=title,
+            save=save,
+            recipient_field=recipient_field,
+            message_kwargs=message_kwargs,
+            mark=mark,
+        )
@@ -0,0 +1,124 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+from django.core.cache import caches
+from django.core.exceptions import ObjectDoesNotExist
+from django.template import Template
+
+from notification.models import MessageTemplate
+from notification.utils import get_notification_settings
+
+DEFAULT_TEMPLATE_CACHE_SIZE = 128
+DEFAULT_TEMPLATE_CACHE_TIMEOUT = 300
+
+
+class LRUCache:
+    """
+    A thread-safe, process-local least recently used cache,
+    entries may expire after `timeout` seconds.
+    """
+
+    def __init__(self, maxsize: int = 128) -> None:
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key, default=None):
+        with self._lock:
+            try:
+                self._data.move_to_end(key)
+            except KeyError:
+                return default
+
+            expires_at, value = self._data[key]
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self._data[key]
+                return default
+            return value
+
+    def set(self, key, value, timeout: float = None) -> None:
+        expires_at = None if timeout is None else time.monotonic() + timeout
+        with self._lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def delete(self, key) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+
+compiled_templates = LRUCache(DEFAULT_TEMPLATE_CACHE_SIZE)
+message_templates = LRUCache(DEFAULT_TEMPLATE_CACHE_SIZE)
+
+
+def make_template_cache_key(code: str) -> str:
+    return f"notification:template:{code}"
+
+
+def get_message_template(code: str) -> MessageTemplate:
+    """
+    Get `MessageTemplate` by code, templates are cached in process memory and,
+    if `alias` is configured, in the django cache for `timeout` seconds.
+    """
+    options = get_notification_settings("template_cache")
+    timeout = options.get("timeout", DEFAULT_TEMPLATE_CACHE_TIMEOUT)
+    message_templates.maxsize = options.get("maxsize", DEFAULT_TEMPLATE_CACHE_SIZE)
+    template = message_templates.get(code)
+    if template is not None:
+        return template
+
+    alias = options.get("alias")
+    if alias:
+        template = caches[alias].get(make_template_cache_key(code))
+
+    if template is None:
+        try:
+            template = MessageTemplate.objects.get(code=code)
+        except ObjectDoesNotExist:
+            raise ValueError(f"Template: {code} doesn't exist.")
+
+        if alias:
+            caches[alias].set(make_template_cache_key(code), template, timeout)
+
+    message_templates.set(code, template, timeout)
+    return template
+
+
+def get_compiled_template(template) -> Template:
+    """
+    Get compiled template of a `MessageTemplate`, it is parsed once per process
+    until the template content changes.
+    """
+    compiled_templates.maxsize = get_notification_settings("template_cache").get(
+        "maxsize", DEFAULT_TEMPLATE_CACHE_SIZE
+    )
+    digest = hashlib.md5(template.content.encode("utf-8")).hexdigest()
+    cached = compiled_templates.get(template.code)
+    if cached is not None and cached[0] == digest:
+        return cached[1]
+
+    compiled = Template(template.content)
+    compiled_templates.set(template.code, (digest, compiled))
+    return compiled
+
+
+def invalidate_template(code: str) -> None:
+    """
+    Remove cached entries of template
+    """
+    compiled_templates.delete(code)
+    message_templates.delete(code)
+    alias = get_notification_settings("template_cache").get("alias")
+    if alias:
+        caches[alias].delete(make_template_cache_key(code))
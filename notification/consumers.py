@@ -1,6 +1,8 @@
+from channels.db import database_sync_to_async
 from channels.generic.websocket import AsyncJsonWebsocketConsumer
+from django.utils.module_loading import import_string
 
-from notification.utils import get_group_name
+from notification.utils import get_group_name, get_notification_settings
 
 
 class NotificationConsumer(AsyncJsonWebsocketConsumer):
@@ -10,18 +12,32 @@ class NotificationConsumer(AsyncJsonWebsocketConsumer):
     must be async functions, and any sync work (like ORM access) has to be
     behind database_sync_to_async or sync_to_async. For more, read
     http://channels.readthedocs.io/en/latest/topics/consumers.html
+
+    Besides the group of user, the consumer joins the groups returned by the
+    callable at ``DJANGO_USER_NOTIFICATION["websocket"]["groups"]``, which takes
+    the scope, e.g. the groups of user's tenant and roles.
     """
 
+    group_names = ()
+
+    def get_group_names(self) -> list[str]:
+        group_names = [get_group_name(self.scope["user"].pk)]
+        get_groups = get_notification_settings("websocket").get("groups")
+        if get_groups:
+            if isinstance(get_groups, str):
+                get_groups = import_string(get_groups)
+            group_names.extend(get_groups(self.scope))
+        return group_names
+
     async def connect(self):
-        await self.channel_layer.group_add(
-            get_group_name(self.scope["user"].pk), self.channel_name
-        )
+        self.group_names = await database_sync_to_async(self.get_group_names)()
+        for group_name in self.group_names:
+            await self.channel_layer.group_add(group_name, self.channel_name)
         await self.accept()
 
     async def disconnect(self, close_code):
-        await self.channel_layer.group_discard(
-            get_group_name(self.scope["user"].pk), self.channel_name
-        )
+        for group_name in self.group_names:
+            await self.channel_layer.group_discard(group_name, self.channel_name)
 
     async def notify_message(self, event):
         """
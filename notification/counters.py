@@ -0,0 +1,63 @@
+import typing
+
+from django.core.cache import caches
+from django.db import transaction
+
+from notification.utils import get_notification_settings
+
+DEFAULT_UNREAD_COUNT_TIMEOUT = 300
+
+
+def get_counter_cache():
+    return caches[get_notification_settings("unread_count").get("alias", "default")]
+
+
+def make_unread_count_key(user_id) -> str:
+    return f"notification:unread:{user_id}"
+
+
+def get_unread_count(user_id, count: typing.Callable[[], int]) -> int:
+    """
+    Get cached unread count of user, `count` is called to count it on a miss.
+    """
+    cache = get_counter_cache()
+    key = make_unread_count_key(user_id)
+    value = cache.get(key)
+    if value is None:
+        value = count()
+        timeout = get_notification_settings("unread_count").get(
+            "timeout", DEFAULT_UNREAD_COUNT_TIMEOUT
+        )
+        cache.add(key, value, timeout=timeout)
+    return value
+
+
+def _incr_unread_counts(deltas: dict) -> None:
+    cache = get_counter_cache()
+    for user_id, delta in deltas.items():
+        key = make_unread_count_key(user_id)
+        try:
+            if cache.incr(key, delta) < 0:
+                cache.delete(key)
+        except ValueError:
+            # Not cached, it is counted on the next read
+            pass
+
+
+def incr_unread_counts(deltas: dict) -> None:
+    """
+    Add deltas of {user_id: delta} to cached unread counts once the current
+    transaction is committed.
+    """
+    deltas = {user_id: delta for user_id, delta in deltas.items() if delta}
+    if deltas:
+        transaction.on_commit(lambda: _incr_unread_counts(deltas))
+
+
+def invalidate_unread_counts(user_ids: typing.Iterable) -> None:
+    """
+    Drop cached unread counts of users once the current transaction is committed
+    """
+    keys = [make_unread_count_key(user_id) for user_id in user_ids]
+    if keys:
+        transaction.on_commit(lambda: get_counter_cache().delete_many(keys))
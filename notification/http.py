@@ -0,0 +1,126 @@
+import asyncio
+import threading
+import weakref
+
+import requests
+from django.utils.module_loading import import_string
+from requests.adapters import HTTPAdapter
+
+from notification.utils import get_notification_settings
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+DEFAULT_TIMEOUT = 10
+
+_session = None
+_session_lock = threading.Lock()
+_async_clients = weakref.WeakKeyDictionary()
+
+
+class TimeoutHTTPAdapter(HTTPAdapter):
+    """
+    HTTP adapter applies a default timeout to requests without one.
+    """
+
+    def __init__(self, *args, timeout=None, **kwargs):
+        self.timeout = timeout
+        super().__init__(*args, **kwargs)
+
+    def send(self, request, **kwargs):
+        if kwargs.get("timeout") is None:
+            kwargs["timeout"] = self.timeout
+        return super().send(request, **kwargs)
+
+
+def create_session() -> requests.Session:
+    """
+    Create http session from ``settings.DJANGO_USER_NOTIFICATION["http"]``
+    """
+    options = get_notification_settings("http")
+    adapter_class = import_string(
+        options.get("adapter_class", "notification.http.TimeoutHTTPAdapter")
+    )
+    adapter = adapter_class(
+        timeout=options.get("timeout", DEFAULT_TIMEOUT),
+        pool_connections=options.get("pool_connections", 10),
+        pool_maxsize=options.get("pool_maxsize", 10),
+        pool_block=options.get("pool_block", False),
+        max_retries=options.get("max_retries", 0),
+    )
+    session = requests.Session()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def get_session() -> requests.Session:
+    """
+    Get the http session shared by backends of this process, so connections are
+    kept alive between requests.
+    """
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = create_session()
+    return _session
+
+
+async def _close_with_loop(client):
+    # An async generator left suspended is closed by the event loop when it
+    # shuts down (e.g. at the end of `asyncio.run`), closing the client with it
+    try:
+        yield
+    finally:
+        await client.aclose()
+
+
+async def get_async_client():
+    """
+    Get the httpx async client shared by backends in the running event loop,
+    return `None` if httpx is not installed. The client is closed when the loop
+    shuts down.
+    """
+    if httpx is None:
+        return None
+
+    loop = asyncio.get_running_loop()
+    client, closer = _async_clients.get(loop, (None, None))
+    if client is None:
+        options = get_notification_settings("http")
+        pool_maxsize = options.get("pool_maxsize", 10)
+        client = httpx.AsyncClient(
+            timeout=options.get("timeout", DEFAULT_TIMEOUT),
+            limits=httpx.Limits(
+                max_connections=options.get("pool_connections", 10) * pool_maxsize,
+                max_keepalive_connections=pool_maxsize,
+            ),
+        )
+        closer = _close_with_loop(client)
+        await closer.__anext__()
+        _async_clients[loop] = (client, closer)
+    return client
+
+
+def close_async_clients() -> None:
+    """
+    Close the httpx async clients of all event loops, each is closed in its own
+    loop as soon as the loop runs
+    """
+    clients = list(_async_clients.items())
+    _async_clients.clear()
+    for loop, (_, closer) in clients:
+        if not loop.is_closed():
+            loop.call_soon_threadsafe(loop.create_task, closer.aclose())
+
+
+def reset_session() -> None:
+    global _session
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+        _session = None
+        close_async_clients()
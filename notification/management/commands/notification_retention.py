@@ -0,0 +1,46 @@
+from django.core.management.base import BaseCommand
+
+from notification.retention import purge
+
+
+class Command(BaseCommand):
+    help = "Delete notifications and messages older than the retention policy"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--backend",
+            action="append",
+            dest="backends",
+            help="Backend id to purge, defaults to all backends",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            help="Number of rows deleted per transaction",
+        )
+        parser.add_argument(
+            "--sleep",
+            type=float,
+            default=0,
+            help="Seconds to wait between batches",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Only count expired rows",
+        )
+
+    def handle(self, *args, **options):
+        counts = purge(
+            backend_ids=options["backends"],
+            batch_size=options["batch_size"],
+            sleep=options["sleep"],
+            dry_run=options["dry_run"],
+        )
+        verb = "Found expired" if options["dry_run"] else "Deleted"
+        self.stdout.write(
+            self.style.SUCCESS(
+                "{} {notifications} notifications, {messages} messages "
+                "and {outbox_jobs} outbox jobs".format(verb, **counts)
+            )
+        )
@@ -0,0 +1,34 @@
+from django.core.management.base import BaseCommand
+
+from notification.retry import run_retry
+
+
+class Command(BaseCommand):
+    help = "Send unsent notifications again with exponential backoff"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=100,
+            help="Number of notifications claimed at a time",
+        )
+        parser.add_argument(
+            "--sleep",
+            type=float,
+            default=5,
+            help="Seconds to wait when no notification is due",
+        )
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Exit when no notification is due",
+        )
+
+    def handle(self, *args, **options):
+        sent = run_retry(
+            batch_size=options["batch_size"],
+            sleep=options["sleep"],
+            once=options["once"],
+        )
+        self.stdout.write(self.style.SUCCESS(f"Sent {sent} notifications"))
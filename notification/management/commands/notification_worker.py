@@ -0,0 +1,36 @@
+from django.core.management.base import BaseCommand
+
+from notification.outbox import run_worker
+
+
+class Command(BaseCommand):
+    help = "Deliver notifications queued in the outbox"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=10,
+            help="Number of jobs claimed at a time",
+        )
+        parser.add_argument(
+            "--sleep",
+            type=float,
+            default=1,
+            help="Seconds to wait when there is no job",
+        )
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Exit when there is no job left",
+        )
+        parser.add_argument("--worker-id", help="Defaults to hostname:pid")
+
+    def handle(self, *args, **options):
+        processed = run_worker(
+            batch_size=options["batch_size"],
+            sleep=options["sleep"],
+            once=options["once"],
+            worker_id=options["worker_id"],
+        )
+        self.stdout.write(self.style.SUCCESS(f"Processed {processed} jobs"))
@@ -0,0 +1,124 @@
+# Generated by Django 5.2.18 on 2026-10-18 00:41
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("notification", "0005_alter_message_id_alter_messagetemplate_id_and_more"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="OutboxJob",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("backend", models.CharField(max_length=255, verbose_name="Backend")),
+                (
+                    "backend_kwargs",
+                    models.JSONField(
+                        blank=True, default=dict, verbose_name="Backend Kwargs"
+                    ),
+                ),
+                (
+                    "payload",
+                    models.JSONField(blank=True, null=True, verbose_name="Payload"),
+                ),
+                (
+                    "recipient_ids",
+                    models.JSONField(
+                        blank=True, default=list, verbose_name="Recipient IDs"
+                    ),
+                ),
+                (
+                    "recipient_field",
+                    models.CharField(
+                        blank=True,
+                        max_length=64,
+                        null=True,
+                        verbose_name="Recipient Field",
+                    ),
+                ),
+                (
+                    "save_notification",
+                    models.BooleanField(default=False, verbose_name="Save Notification"),
+                ),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("pending", "Pending"),
+                            ("processing", "Processing"),
+                            ("done", "Done"),
+                            ("failed", "Failed"),
+                        ],
+                        default="pending",
+                        max_length=16,
+                        verbose_name="Status",
+                    ),
+                ),
+                (
+                    "attempts",
+                    models.PositiveIntegerField(default=0, verbose_name="Attempts"),
+                ),
+                (
+                    "available_at",
+                    models.DateTimeField(
+                        default=django.utils.timezone.now, verbose_name="Available At"
+                    ),
+                ),
+                (
+                    "claimed_by",
+                    models.CharField(
+                        blank=True, max_length=128, null=True, verbose_name="Claimed By"
+                    ),
+                ),
+                (
+                    "claimed_at",
+                    models.DateTimeField(
+                        blank=True, null=True, verbose_name="Claimed At"
+                    ),
+                ),
+                ("error", models.TextField(blank=True, null=True, verbose_name="Error")),
+                (
+                    "created_at",
+                    models.DateTimeField(auto_now_add=True, verbose_name="Created At"),
+                ),
+                (
+                    "updated_at",
+                    models.DateTimeField(auto_now=True, verbose_name="Updated At"),
+                ),
+                (
+                    "message",
+                    models.ForeignKey(
+                        db_constraint=False,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="outbox_jobs",
+                        to="notification.message",
+                        verbose_name="Message",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Outbox Job",
+                "db_table": "notification_outbox",
+                "indexes": [
+                    models.Index(
+                        fields=["status", "available_at"],
+                        name="outbox_status_available_idx",
+                    )
+                ],
+            },
+        ),
+    ]
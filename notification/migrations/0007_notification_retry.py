@@ -0,0 +1,25 @@
+# Generated by Django 5.2.18 on 2026-10-18 00:44
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("notification", "0006_outboxjob"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="notification",
+            name="attempts",
+            field=models.PositiveIntegerField(default=0, verbose_name="Attempts"),
+        ),
+        migrations.AddField(
+            model_name="notification",
+            name="next_attempt_at",
+            field=models.DateTimeField(
+                blank=True, null=True, verbose_name="Next Attempt At"
+            ),
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 5.2.18 on 2026-10-18 00:47
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("notification", "0007_notification_retry"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="notification",
+            index=models.Index(
+                condition=models.Q(("is_ignored", False)),
+                fields=["to", "-created_at", "-id"],
+                name="notification_inbox_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="notification",
+            index=models.Index(
+                condition=models.Q(("has_read", False), ("is_ignored", False)),
+                fields=["to"],
+                name="notification_unread_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="notification",
+            index=models.Index(
+                condition=models.Q(("is_ignored", False), ("is_sent", False)),
+                fields=["next_attempt_at"],
+                name="notification_retry_idx",
+            ),
+        ),
+    ]
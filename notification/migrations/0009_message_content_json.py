@@ -0,0 +1,26 @@
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("notification", "0008_notification_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="message",
+            name="content_json",
+            field=models.JSONField(
+                blank=True, null=True, encoder=DjangoJSONEncoder, verbose_name="Content"
+            ),
+        ),
+        migrations.AddField(
+            model_name="message",
+            name="content_hash",
+            field=models.CharField(
+                max_length=64, null=True, editable=False, verbose_name="Content Hash"
+            ),
+        ),
+    ]
@@ -0,0 +1,90 @@
+import ast
+import hashlib
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import migrations
+from django.db.models import Count, Min
+
+BATCH_SIZE = 1000
+
+
+def parse_content(content):
+    # Dict contents were saved as their python repr
+    if content is None:
+        return None
+    try:
+        value = ast.literal_eval(content)
+    except (ValueError, SyntaxError):
+        return content
+    return value if isinstance(value, dict) else content
+
+
+def make_content_hash(*args):
+    value = json.dumps(args, sort_keys=True, cls=DjangoJSONEncoder, ensure_ascii=False)
+    return hashlib.sha256(value.encode("utf-8")).hexdigest()
+
+
+def fill_content_hash(Message):
+    queryset = Message.objects.order_by("pk").only(
+        "title", "mark", "msg_type", "content"
+    )
+    last_pk = 0
+    while True:
+        messages = list(queryset.filter(pk__gt=last_pk)[:BATCH_SIZE])
+        if not messages:
+            return
+        for message in messages:
+            message.content_json = parse_content(message.content)
+            message.content_hash = make_content_hash(
+                message.msg_type, message.title, message.mark, message.content_json
+            )
+        Message.objects.bulk_update(messages, ["content_json", "content_hash"])
+        last_pk = messages[-1].pk
+
+
+def merge_duplicates(Message, Notification, OutboxJob):
+    # Group duplicates in the database, a batch of hashes at a time
+    groups = (
+        Message.objects.values("content_hash")
+        .annotate(keep_pk=Min("pk"), count=Count("pk"))
+        .filter(count__gt=1)
+        .order_by("content_hash")
+    )
+    last_hash = ""
+    while True:
+        keep_pks = {
+            group["content_hash"]: group["keep_pk"]
+            for group in groups.filter(content_hash__gt=last_hash)[:BATCH_SIZE]
+        }
+        if not keep_pks:
+            return
+        duplicates = Message.objects.filter(content_hash__in=list(keep_pks)).exclude(
+            pk__in=list(keep_pks.values())
+        )
+        for duplicate_pk, content_hash in duplicates.values_list("pk", "content_hash"):
+            pk = keep_pks[content_hash]
+            Notification.objects.filter(message_id=duplicate_pk).update(message_id=pk)
+            OutboxJob.objects.filter(message_id=duplicate_pk).update(message_id=pk)
+        duplicates.delete()
+        last_hash = max(keep_pks)
+
+
+def deduplicate_messages(apps, schema_editor):
+    Message = apps.get_model("notification", "Message")
+    Notification = apps.get_model("notification", "Notification")
+    OutboxJob = apps.get_model("notification", "OutboxJob")
+
+    fill_content_hash(Message)
+    merge_duplicates(Message, Notification, OutboxJob)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("notification", "0009_message_content_json"),
+    ]
+
+    operations = [
+        migrations.RunPython(deduplicate_messages, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,32 @@
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("notification", "0010_deduplicate_messages"),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name="message",
+            name="content",
+        ),
+        migrations.RenameField(
+            model_name="message",
+            old_name="content_json",
+            new_name="content",
+        ),
+        migrations.AlterField(
+            model_name="message",
+            name="content_hash",
+            field=models.CharField(
+                editable=False, max_length=64, unique=True, verbose_name="Content Hash"
+            ),
+        ),
+        migrations.RemoveField(
+            model_name="outboxjob",
+            name="payload",
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-18 00:51
+
+import django.contrib.postgres.indexes
+from django.conf import settings
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("notification", "0011_message_content_hash"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="message",
+            index=django.contrib.postgres.indexes.BrinIndex(
+                fields=["created_at"], name="message_created_brin"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="notification",
+            index=django.contrib.postgres.indexes.BrinIndex(
+                fields=["created_at"], name="notification_created_brin"
+            ),
+        ),
+    ]
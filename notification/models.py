@@ -1,9 +1,23 @@
 from django.conf import settings
-from django.contrib.postgres.indexes import GinIndex
-from django.db import models
+from django.contrib.postgres.indexes import BrinIndex, GinIndex
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models, transaction
+from django.dispatch import Signal
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 from tinymce.models import HTMLField
 
+from notification.counters import (
+    get_unread_count,
+    incr_unread_counts,
+    invalidate_unread_counts,
+)
+from notification.utils import chunked, make_content_hash
+
+# Sent once by the bulk `mark_*` queryset methods, with `action` ("read",
+# "ignored" or "sent"), `user_ids` of changed notifications and their `count`.
+notifications_marked = Signal()
+
 
 class NotificationQuerySet(models.QuerySet):
     def read(self):
@@ -14,9 +28,73 @@ class NotificationQuerySet(models.QuerySet):
 
     def unread(self, user):
         """
-        return unread notification messages
+        return unread notification messages of user
+        """
+        return self.filter(to=user, has_read=False, is_ignored=False)
+
+    def unread_count(self, user) -> int:
+        """
+        Return cached unread count of user, of all their notifications whatever
+        the filters of this queryset
+        """
+        manager = self.model._default_manager
+        return get_unread_count(user.pk, lambda: manager.unread(user).count())
+
+    def _get_user_ids(self) -> list:
+        return list(self.order_by().values_list("to_id", flat=True).distinct())
+
+    def _mark(self, action: str, **values) -> int:
+        # Only update rows that change
+        queryset = self.filter(**{field: not value for field, value in values.items()})
+        user_ids = queryset._get_user_ids()
+        if not user_ids:
+            return 0
+
+        count = super(NotificationQuerySet, queryset).update(
+            **values, updated_at=timezone.now()
+        )
+        if "has_read" in values or "is_ignored" in values:
+            invalidate_unread_counts(user_ids)
+        notifications_marked.send(
+            sender=self.model, action=action, user_ids=user_ids, count=count
+        )
+        return count
+
+    def mark_read(self) -> int:
+        """
+        Mark notification messages as read with one UPDATE,
+        return the number of changed notifications.
+        """
+        return self._mark("read", has_read=True)
+
+    def mark_ignored(self) -> int:
+        """
+        Mark notification messages as ignored with one UPDATE,
+        return the number of changed notifications.
+        """
+        return self._mark("ignored", is_ignored=True)
+
+    def mark_sent(self) -> int:
         """
-        return self.filter(has_read=False)
+        Mark notification messages as sent with one UPDATE,
+        return the number of changed notifications.
+        """
+        return self._mark("sent", is_sent=True)
+
+    def update(self, **kwargs):
+        if "has_read" not in kwargs and "is_ignored" not in kwargs:
+            return super().update(**kwargs)
+
+        user_ids = self._get_user_ids()
+        rows = super().update(**kwargs)
+        invalidate_unread_counts(user_ids)
+        return rows
+
+    def delete(self):
+        user_ids = self._get_user_ids()
+        deleted = super().delete()
+        invalidate_unread_counts(user_ids)
+        return deleted
 
     def ignored(self):
         """
@@ -36,6 +114,33 @@ class NotificationQuerySet(models.QuerySet):
         """
         return self.filter(is_sent=False)
 
+    def inbox(self, user, before: tuple = None):
+        """
+        Return not ignored notification messages of user, newest first.
+        `before` is a (created_at, id) position to continue from, so deep pages
+        are read from the index instead of skipping rows with OFFSET.
+        """
+        queryset = self.filter(to=user, is_ignored=False)
+        if before is not None:
+            created_at, pk = before
+            queryset = queryset.filter(
+                models.Q(created_at__lt=created_at)
+                | models.Q(created_at=created_at, id__lt=pk)
+            )
+        return queryset.order_by("-created_at", "-id")
+
+    def retryable(self, max_attempts: int):
+        """
+        Return unsent notification messages due to retry
+        """
+        return self.filter(
+            models.Q(next_attempt_at__isnull=True)
+            | models.Q(next_attempt_at__lte=timezone.now()),
+            is_sent=False,
+            is_ignored=False,
+            attempts__lt=max_attempts,
+        )
+
 
 class Notification(models.Model):
     has_read = models.BooleanField(verbose_name=_("Read Or Not"), default=False)
@@ -57,6 +162,10 @@ class Notification(models.Model):
     notify_kwargs = models.JSONField(
         verbose_name=_("Notify Kwargs"), blank=True, default=dict
     )
+    attempts = models.PositiveIntegerField(default=0, verbose_name=_("Attempts"))
+    next_attempt_at = models.DateTimeField(
+        null=True, blank=True, verbose_name=_("Next Attempt At")
+    )
     created_at = models.DateTimeField(auto_now_add=True, verbose_name=_("Created At"))
     updated_at = models.DateTimeField(auto_now=True, verbose_name=_("Updated At"))
 
@@ -65,6 +174,28 @@ class Notification(models.Model):
     class Meta:
         verbose_name = _("Notification")
         db_table = "notification"
+        indexes = [
+            # Inbox listing of a user, newest first
+            models.Index(
+                fields=["to", "-created_at", "-id"],
+                name="notification_inbox_idx",
+                condition=models.Q(is_ignored=False),
+            ),
+            # Unread count of a user
+            models.Index(
+                fields=["to"],
+                name="notification_unread_idx",
+                condition=models.Q(has_read=False, is_ignored=False),
+            ),
+            # Scan of notifications due to retry
+            models.Index(
+                fields=["next_attempt_at"],
+                name="notification_retry_idx",
+                condition=models.Q(is_sent=False, is_ignored=False),
+            ),
+            # Retention scans, rows are appended in created_at order
+            BrinIndex(fields=["created_at"], name="notification_created_brin"),
+        ]
 
     def __str__(self):
         return str(self.message)
@@ -73,15 +204,19 @@ class Notification(models.Model):
         """
         Mark a notification message as read.
         """
+        delta = -1 if not self.has_read and not self.is_ignored else 0
         self.has_read = True
         self.save(update_fields=["has_read", "updated_at"])
+        incr_unread_counts({self.to_id: delta})
 
     def mark_as_unread(self):
         """
         Mark a notification message as unread.
         """
+        delta = 1 if self.has_read and not self.is_ignored else 0
         self.has_read = False
         self.save(update_fields=["has_read", "updated_at"])
+        incr_unread_counts({self.to_id: delta})
 
     def mark_as_sent(self):
         """
@@ -94,8 +229,10 @@ class Notification(models.Model):
         """
         Mark a notification message as ignored.
         """
+        delta = -1 if not self.has_read and not self.is_ignored else 0
         self.is_ignored = True
         self.save(update_fields=["is_ignored", "updated_at"])
+        incr_unread_counts({self.to_id: delta})
 
 
 class MessageTemplate(models.Model):
@@ -147,6 +284,41 @@ class MessageTemplate(models.Model):
         self.save(update_fields=["is_ignored", "updated_at"])
 
 
+class MessageQuerySet(models.QuerySet):
+    def get_or_create_many(self, messages: list, batch_size: int = 1000) -> None:
+        """
+        Save messages, identical messages share one row by content hash.
+        Each message gets the pk of its row.
+        """
+        unique = {}
+        for message in messages:
+            message.content_hash = message.make_content_hash()
+            unique.setdefault(message.content_hash, message)
+
+        pks = {}
+        with transaction.atomic(using=self.db):
+            # Rows are locked until the transaction of the caller is committed,
+            # so retention can't delete a reused row before notifications saved
+            # in that transaction use it. Rows deleted before they are locked
+            # are created again.
+            while len(pks) < len(unique):
+                missing = [
+                    m for content_hash, m in unique.items() if content_hash not in pks
+                ]
+                self.bulk_create(missing, batch_size=batch_size, ignore_conflicts=True)
+                for batch in chunked(missing, batch_size):
+                    pks.update(
+                        self.select_for_update()
+                        .filter(content_hash__in=[m.content_hash for m in batch])
+                        .order_by("pk")
+                        .values_list("content_hash", "pk")
+                    )
+        for message in messages:
+            message.pk = pks[message.content_hash]
+            message._state.adding = False
+            message._state.db = self.db
+
+
 class Message(models.Model):
     """
     Message
@@ -163,10 +335,15 @@ class Message(models.Model):
     msg_type = models.CharField(
         max_length=64, verbose_name=_("Message Type"), db_index=True
     )
-    content = models.TextField(verbose_name=_("Content"), null=True, blank=True)
+    content = models.JSONField(
+        verbose_name=_("Content"), null=True, blank=True, encoder=DjangoJSONEncoder
+    )
+    content_hash = models.CharField(
+        max_length=64, unique=True, editable=False, verbose_name=_("Content Hash")
+    )
     created_at = models.DateTimeField(auto_now_add=True, verbose_name=_("Created At"))
 
-    objects = models.Manager()
+    objects = MessageQuerySet.as_manager()
 
     class Meta:
         verbose_name = _("Message")
@@ -176,8 +353,96 @@ class Message(models.Model):
                 fields=["mark"],
                 name="mark_gin_index",
             ),
+            BrinIndex(fields=["created_at"], name="message_created_brin"),
         ]
 
     def __str__(self):
         return str(self.title)
 
+    def make_content_hash(self) -> str:
+        return make_content_hash(self.msg_type, self.title, self.mark, self.content)
+
+    def save(self, *args, **kwargs):
+        """
+        Save message, a new message identical to a saved one takes its row
+        instead of inserting a duplicate
+        """
+        self.content_hash = self.make_content_hash()
+        if self._state.adding and self.pk is None:
+            manager = type(self)._default_manager.db_manager(kwargs.get("using"))
+            manager.get_or_create_many([self])
+            return
+        super().save(*args, **kwargs)
+
+
+class OutboxJob(models.Model):
+    """
+    A pending delivery of message to recipients through a backend,
+    processed by the `notification_worker` command.
+    """
+
+    STATUS_PENDING = "pending"
+    STATUS_PROCESSING = "processing"
+    STATUS_DONE = "done"
+    STATUS_FAILED = "failed"
+    STATUS_CHOICES = [
+        (STATUS_PENDING, _("Pending")),
+        (STATUS_PROCESSING, _("Processing")),
+        (STATUS_DONE, _("Done")),
+        (STATUS_FAILED, _("Failed")),
+    ]
+
+    backend = models.CharField(max_length=255, verbose_name=_("Backend"))
+    backend_kwargs = models.JSONField(
+        verbose_name=_("Backend Kwargs"), blank=True, default=dict
+    )
+    message = models.ForeignKey(
+        "Message",
+        verbose_name=_("Message"),
+        on_delete=models.CASCADE,
+        db_constraint=False,
+        related_name="outbox_jobs",
+    )
+    recipient_ids = models.JSONField(
+        verbose_name=_("Recipient IDs"), blank=True, default=list
+    )
+    recipient_field = models.CharField(
+        max_length=64, verbose_name=_("Recipient Field"), null=True, blank=True
+    )
+    save_notification = models.BooleanField(
+        verbose_name=_("Save Notification"), default=False
+    )
+    status = models.CharField(
+        max_length=16,
+        choices=STATUS_CHOICES,
+        default=STATUS_PENDING,
+        verbose_name=_("Status"),
+    )
+    attempts = models.PositiveIntegerField(verbose_name=_("Attempts"), default=0)
+    available_at = models.DateTimeField(
+        verbose_name=_("Available At"), default=timezone.now
+    )
+    claimed_by = models.CharField(
+        max_length=128, verbose_name=_("Claimed By"), null=True, blank=True
+    )
+    claimed_at = models.DateTimeField(
+        verbose_name=_("Claimed At"), null=True, blank=True
+    )
+    error = models.TextField(verbose_name=_("Error"), null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name=_("Created At"))
+    updated_at = models.DateTimeField(auto_now=True, verbose_name=_("Updated At"))
+
+    objects = models.Manager()
+
+    class Meta:
+        verbose_name = _("Outbox Job")
+        db_table = "notification_outbox"
+        indexes = [
+            models.Index(
+                fields=["status", "available_at"],
+                name="outbox_status_available_idx",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.backend}: {self.message_id}"
@@ -0,0 +1,207 @@
+import logging
+import os
+import socket
+import time
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models import Q, QuerySet
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from notification.cache import get_message_template
+from notification.models import OutboxJob
+from notification.pool import backend_pool
+from notification.utils import chunked, get_backoff, get_notification_settings
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_OUTBOX_BATCH_SIZE = 500
+DEFAULT_CLAIM_TIMEOUT = 600
+DEFAULT_MAX_ATTEMPTS = 5
+
+
+def get_outbox_setting(name: str, default=None):
+    return get_notification_settings("outbox").get(name, default)
+
+
+def enqueue(
+    recipients,
+    title: str = None,
+    message: str = None,
+    template_code: str = None,
+    context: dict = None,
+    save: bool = False,
+    backends=None,
+    recipient_field: str = None,
+    message_kwargs: dict = None,
+    mark: dict = None,
+    **kwargs,
+) -> list[OutboxJob]:
+    """
+    Save messages and outbox jobs of `notify` in one transaction, they are
+    delivered later by the `notification_worker` command.
+    """
+    from notification.base import get_backends
+
+    if callable(recipient_field):
+        raise ValueError("`recipient_field` must be a field name to use outbox.")
+
+    if isinstance(recipients, QuerySet):
+        recipient_ids = list(recipients.values_list("pk", flat=True))
+    else:
+        recipients = list(recipients or [])
+        recipient_ids = [recipient.pk for recipient in recipients]
+    batch_size = get_outbox_setting("batch_size", DEFAULT_OUTBOX_BATCH_SIZE)
+    template = get_message_template(template_code) if template_code else None
+    if template and isinstance(template.backend_kwargs, dict):
+        backend_kwargs = {**template.backend_kwargs, **kwargs}
+    else:
+        backend_kwargs = kwargs
+
+    jobs = []
+    with transaction.atomic():
+        for backend in get_backends(backends, template, **kwargs):
+            msg_title, msg_kwargs, content = title, message_kwargs or {}, message
+            if template:
+                content = backend.render_template(template, context)
+                msg_title = title or template.title
+                if template.message_kwargs:
+                    msg_kwargs = {**template.message_kwargs, **msg_kwargs}
+
+            payload = backend.make_content(
+                msg_title, content, recipients, recipient_field, **msg_kwargs
+            )
+            msg = backend.message_class(
+                title=msg_title, content=payload, mark=mark, msg_type=backend.id
+            )
+            backend.message_class.objects.get_or_create_many([msg])
+            backend_cls = backend.__class__
+            for ids in chunked(recipient_ids, batch_size) if recipient_ids else [[]]:
+                jobs.append(
+                    OutboxJob(
+                        backend=f"{backend_cls.__module__}.{backend_cls.__qualname__}",
+                        backend_kwargs=backend_kwargs,
+                        message=msg,
+                        recipient_ids=ids,
+                        recipient_field=recipient_field,
+                        save_notification=save,
+                    )
+                )
+        return OutboxJob.objects.bulk_create(jobs)
+
+
+def claim_jobs(worker_id: str, limit: int) -> list[OutboxJob]:
+    """
+    Claim available jobs with ``SELECT ... FOR UPDATE SKIP LOCKED``, so workers
+    never claim the same job. Only job rows are locked, jobs sharing a message
+    are claimed by different workers. Jobs of crashed workers are claimed again
+    after `claim_timeout` seconds.
+    """
+    now = timezone.now()
+    stale_at = now - timedelta(
+        seconds=get_outbox_setting("claim_timeout", DEFAULT_CLAIM_TIMEOUT)
+    )
+    with transaction.atomic():
+        jobs = list(
+            OutboxJob.objects.select_for_update(skip_locked=True, of=("self",))
+            .filter(
+                Q(status=OutboxJob.STATUS_PENDING, available_at__lte=now)
+                | Q(status=OutboxJob.STATUS_PROCESSING, claimed_at__lt=stale_at)
+            )
+            .select_related("message")
+            .order_by("id")[:limit]
+        )
+        for job in jobs:
+            job.status = OutboxJob.STATUS_PROCESSING
+            job.claimed_by = worker_id
+            job.claimed_at = now
+            job.attempts += 1
+            job.updated_at = now
+        OutboxJob.objects.bulk_update(
+            jobs, ["status", "claimed_by", "claimed_at", "attempts", "updated_at"]
+        )
+    return jobs
+
+
+def process_job(job: OutboxJob) -> None:
+    """
+    Deliver the message of job to its recipients. If some deliveries fail,
+    the job keeps only their recipient ids and an error is raised, so they
+    are retried by `complete_job`.
+    """
+    backend_kwargs = {**job.backend_kwargs, "fail_silently": True}
+    message = job.message
+    recipients = get_user_model().objects.filter(pk__in=job.recipient_ids)
+    last_attempt = job.attempts >= get_outbox_setting(
+        "max_attempts", DEFAULT_MAX_ATTEMPTS
+    )
+    with backend_pool.get(import_string(job.backend), **backend_kwargs) as backend:
+        chunks = backend.get_recipient_chunks(recipients, job.recipient_field)
+        # Failed notifications are saved for the retry worker only once the job
+        # gives up, otherwise the job retries them itself.
+        with backend.collect_failures(save=last_attempt) as failures:
+            try:
+                backend.send_chunks(
+                    message, chunks, job.recipient_field, save=job.save_notification
+                )
+            finally:
+                backend.flush()
+
+    if failures:
+        job.recipient_ids = [
+            recipient.pk for recipient, _ in failures if recipient is not None
+        ]
+        raise RuntimeError(
+            "Failed to deliver to %s recipients: %s" % (len(failures), failures[0][1])
+        )
+
+
+def complete_job(job: OutboxJob, exc: Exception = None) -> None:
+    now = timezone.now()
+    if exc is None:
+        job.status = OutboxJob.STATUS_DONE
+        job.error = None
+    elif job.attempts >= get_outbox_setting("max_attempts", DEFAULT_MAX_ATTEMPTS):
+        job.status = OutboxJob.STATUS_FAILED
+        job.error = str(exc)
+    else:
+        job.status = OutboxJob.STATUS_PENDING
+        job.available_at = now + get_backoff(job.attempts, base=30)
+        job.error = str(exc)
+    job.updated_at = now
+    job.save(
+        update_fields=["status", "available_at", "error", "recipient_ids", "updated_at"]
+    )
+
+
+def run_worker(
+    batch_size: int = 10,
+    sleep: float = 1,
+    once: bool = False,
+    worker_id: str = None,
+) -> int:
+    """
+    Process outbox jobs until stopped, or until no job is left with `once`.
+    Return the number of processed jobs.
+    """
+    worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}"
+    processed = 0
+    while True:
+        jobs = claim_jobs(worker_id, batch_size)
+        if not jobs:
+            if once:
+                return processed
+            time.sleep(sleep)
+            continue
+
+        for job in jobs:
+            try:
+                process_job(job)
+            except Exception as e:
+                logger.exception("Failed to process outbox job: %s", job.pk)
+                complete_job(job, e)
+            else:
+                complete_job(job)
+            processed += 1
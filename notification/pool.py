@@ -0,0 +1,82 @@
+import threading
+from contextlib import contextmanager
+
+from notification.utils import get_notification_settings
+
+DEFAULT_POOL_MAXSIZE = 16
+
+
+class BackendPool:
+    """
+    Idle backend instances by (class, kwargs). An instance is used by one caller
+    at a time, because it buffers notifications while sending.
+    """
+
+    def __init__(self) -> None:
+        self._idle = {}
+        self._lock = threading.Lock()
+
+    def get_maxsize(self) -> int:
+        """
+        Max idle instances kept per key, 0 disables the pool
+        """
+        return get_notification_settings("backend_pool").get(
+            "maxsize", DEFAULT_POOL_MAXSIZE
+        )
+
+    def make_key(self, backend_cls, kwargs: dict):
+        try:
+            key = (backend_cls, frozenset(kwargs.items()))
+            hash(key)
+        except TypeError:
+            # Unhashable kwargs, e.g. lists of groups
+            return None
+        return key
+
+    def acquire(self, backend_cls, **kwargs):
+        """
+        Take an idle instance of backend_cls created with kwargs,
+        or create a new one.
+        """
+        key = self.make_key(backend_cls, kwargs) if self.get_maxsize() else None
+        if key is not None:
+            with self._lock:
+                idle = self._idle.get(key)
+                if idle:
+                    return idle.pop()
+
+        backend = backend_cls(**kwargs)
+        backend._pool_key = key
+        return backend
+
+    def release(self, backend) -> None:
+        """
+        Give back an instance taken by `acquire`
+        """
+        key = getattr(backend, "_pool_key", None)
+        if key is not None and backend.is_idle():
+            with self._lock:
+                idle = self._idle.setdefault(key, [])
+                if len(idle) < self.get_maxsize():
+                    idle.append(backend)
+                    return
+
+        backend.close()
+
+    @contextmanager
+    def get(self, backend_cls, **kwargs):
+        backend = self.acquire(backend_cls, **kwargs)
+        try:
+            yield backend
+        finally:
+            self.release(backend)
+
+    def clear(self) -> None:
+        with self._lock:
+            backends = [backend for idle in self._idle.values() for backend in idle]
+            self._idle.clear()
+        for backend in backends:
+            backend.close()
+
+
+backend_pool = BackendPool()
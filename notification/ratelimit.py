@@ -0,0 +1,140 @@
+import asyncio
+import math
+import threading
+import time
+
+from django.core.cache import caches
+
+from notification.utils import get_notification_settings
+
+
+class RateLimiter:
+    """
+    Allow `rate` requests per second, with bursts of up to `burst` requests.
+    """
+
+    def __init__(self, key: str, rate: float, burst: int = None) -> None:
+        if rate <= 0:
+            raise ValueError("`rate` must be greater than 0.")
+
+        self.key = key
+        self.rate = rate
+        self.burst = max(int(burst or math.ceil(rate)), 1)
+
+    def acquire(self) -> float:
+        """
+        Take a request from the limit, return 0 if it is allowed, otherwise
+        the seconds to wait before trying again.
+        """
+        raise NotImplementedError
+
+    def wait(self) -> None:
+        """
+        Block until a request is allowed
+        """
+        while True:
+            delay = self.acquire()
+            if delay <= 0:
+                return
+            time.sleep(delay)
+
+    async def async_wait(self) -> None:
+        """
+        Async version of `wait`
+        """
+        while True:
+            delay = self.acquire()
+            if delay <= 0:
+                return
+            await asyncio.sleep(delay)
+
+
+class TokenBucket(RateLimiter):
+    """
+    Token bucket of this process, it refills `rate` tokens per second
+    and holds at most `burst` tokens.
+    """
+
+    def __init__(self, key: str, rate: float, burst: int = None) -> None:
+        super().__init__(key, rate, burst)
+        self._tokens = float(self.burst)
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> float:
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                self.burst, self._tokens + (now - self._updated_at) * self.rate
+            )
+            self._updated_at = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return 0
+            return (1 - self._tokens) / self.rate
+
+
+class CacheRateLimiter(RateLimiter):
+    """
+    Rate limiter shared by processes through a django cache, counting requests
+    in windows of `burst / rate` seconds. The cache must support atomic `incr`.
+    """
+
+    def __init__(self, key: str, rate: float, burst: int = None, alias: str = None):
+        super().__init__(key, rate, burst)
+        self.alias = alias or "default"
+        self.window = self.burst / self.rate
+
+    def acquire(self) -> float:
+        cache = caches[self.alias]
+        now = time.time()
+        window = int(now // self.window)
+        cache_key = f"notification:ratelimit:{self.key}:{window}"
+        cache.add(cache_key, 0, timeout=math.ceil(self.window) + 1)
+        try:
+            count = cache.incr(cache_key)
+        except ValueError:
+            # The key expired between add and incr
+            cache.add(cache_key, 1, timeout=math.ceil(self.window) + 1)
+            count = 1
+        if count <= self.burst:
+            return 0
+        return (window + 1) * self.window - now
+
+
+_limiters = {}
+_lock = threading.Lock()
+
+
+def get_rate_limiter(backend_id: str):
+    """
+    Get rate limiter of backend configured by
+    ``settings.DJANGO_USER_NOTIFICATION[backend_id]["rate_limit"]``,
+    None if it is not limited.
+    """
+    options = get_notification_settings(backend_id).get("rate_limit")
+    if not options:
+        return None
+
+    with _lock:
+        limiter = _limiters.get(backend_id)
+        if limiter is None:
+            if options.get("cache"):
+                limiter = CacheRateLimiter(
+                    backend_id,
+                    options["rate"],
+                    options.get("burst"),
+                    alias=options["cache"],
+                )
+            else:
+                limiter = TokenBucket(backend_id, options["rate"], options.get("burst"))
+            _limiters[backend_id] = limiter
+        return limiter
+
+
+def reset_rate_limiters() -> None:
+    """
+    Drop rate limiters, they are created again with the current settings
+    """
+    with _lock:
+        _limiters.clear()
@@ -0,0 +1,127 @@
+import logging
+import time
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import Exists, OuterRef
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from notification.models import Message, Notification, OutboxJob
+from notification.utils import get_notification_settings, load_backends
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_RETENTION_BATCH_SIZE = 1000
+
+
+def get_retention_setting(name: str, default=None):
+    return get_notification_settings("retention").get(name, default)
+
+
+def get_retention_days(backend_id: str):
+    """
+    Get days to keep notifications of backend, None to keep them forever
+    """
+    days = get_notification_settings(backend_id).get("retention_days")
+    if days is None:
+        days = get_retention_setting("days")
+    return days
+
+
+def delete_in_batches(queryset, batch_size: int, archive=None, sleep: float = 0) -> int:
+    """
+    Delete rows of queryset, `batch_size` rows per transaction, so tables are
+    never locked for long. `archive` is called with each batch queryset before
+    it is deleted. Return the number of deleted rows.
+    """
+    model = queryset.model
+    deleted = 0
+    while True:
+        pks = list(queryset.order_by().values_list("pk", flat=True)[:batch_size])
+        if not pks:
+            return deleted
+
+        with transaction.atomic():
+            # Lock the batch and filter it again, rows may not match anymore,
+            # e.g. a message reused by a notification saved meanwhile
+            pks = list(
+                model._default_manager.select_for_update()
+                .filter(pk__in=pks)
+                .values_list("pk", flat=True)
+            )
+            batch = queryset.filter(pk__in=pks)
+            if archive is not None:
+                archive(batch)
+            deleted += batch.delete()[1].get(model._meta.label, 0)
+
+        if sleep:
+            time.sleep(sleep)
+
+
+def get_expired_querysets(backend_id: str, days: int):
+    """
+    Get querysets of expired notifications and messages of backend, messages
+    still used by notifications or outbox jobs are kept.
+    """
+    cutoff = timezone.now() - timedelta(days=days)
+    notifications = Notification.objects.filter(
+        message__msg_type=backend_id, created_at__lt=cutoff
+    )
+    messages = Message.objects.filter(msg_type=backend_id, created_at__lt=cutoff).filter(
+        ~Exists(Notification.objects.filter(message=OuterRef("pk"))),
+        ~Exists(OutboxJob.objects.filter(message=OuterRef("pk"))),
+    )
+    return notifications, messages
+
+
+def purge(
+    backend_ids=None,
+    batch_size: int = None,
+    sleep: float = 0,
+    dry_run: bool = False,
+) -> dict:
+    """
+    Delete, or archive then delete, notifications and messages older than the
+    retention policy of each backend, and finished outbox jobs. Return the
+    number of deleted (or expired with `dry_run`) rows by model.
+    """
+    from notification.base import backend_registry
+
+    load_backends()
+    batch_size = batch_size or get_retention_setting(
+        "batch_size", DEFAULT_RETENTION_BATCH_SIZE
+    )
+    archive = get_retention_setting("archive")
+    if isinstance(archive, str):
+        archive = import_string(archive)
+
+    counts = {"notifications": 0, "messages": 0, "outbox_jobs": 0}
+    for backend_id in backend_ids or list(backend_registry):
+        days = get_retention_days(backend_id)
+        if days is None:
+            continue
+
+        notifications, messages = get_expired_querysets(backend_id, days)
+        if dry_run:
+            counts["notifications"] += notifications.count()
+            counts["messages"] += messages.count()
+            continue
+
+        counts["notifications"] += delete_in_batches(
+            notifications, batch_size, archive=archive, sleep=sleep
+        )
+        counts["messages"] += delete_in_batches(messages, batch_size, sleep=sleep)
+        logger.info("Purged notifications of %s older than %s days", backend_id, days)
+
+    days = get_retention_setting("days")
+    if days is not None:
+        jobs = OutboxJob.objects.filter(
+            status__in=[OutboxJob.STATUS_DONE, OutboxJob.STATUS_FAILED],
+            updated_at__lt=timezone.now() - timedelta(days=days),
+        )
+        if dry_run:
+            counts["outbox_jobs"] += jobs.count()
+        else:
+            counts["outbox_jobs"] += delete_in_batches(jobs, batch_size, sleep=sleep)
+    return counts
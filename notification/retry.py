@@ -0,0 +1,89 @@
+import logging
+import time
+
+from django.db import transaction
+from django.utils import timezone
+
+from notification.models import Notification
+from notification.pool import backend_pool
+from notification.utils import (
+    get_backoff,
+    get_notification_backend_class,
+    get_notification_settings,
+)
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_ATTEMPTS = 5
+
+
+def get_max_attempts() -> int:
+    return get_notification_settings("retry").get("max_attempts", DEFAULT_MAX_ATTEMPTS)
+
+
+def schedule_next_attempt(notifications: list[Notification]) -> None:
+    """
+    Count an attempt of notifications and schedule the next one, so they are
+    retried later if the worker dies while sending.
+    """
+    now = timezone.now()
+    for notification in notifications:
+        notification.attempts += 1
+        notification.next_attempt_at = now + get_backoff(notification.attempts)
+        notification.updated_at = now
+    Notification.objects.bulk_update(
+        notifications, ["attempts", "next_attempt_at", "updated_at"]
+    )
+
+
+def claim_notifications(limit: int) -> list[Notification]:
+    """
+    Claim unsent notifications due to retry with ``SELECT ... FOR UPDATE SKIP
+    LOCKED``, so workers never retry the same notification at once.
+    """
+    with transaction.atomic():
+        notifications = list(
+            Notification.objects.retryable(get_max_attempts())
+            .select_for_update(skip_locked=True, of=("self",))
+            .select_related("to", "message")
+            .order_by("next_attempt_at", "id")[:limit]
+        )
+        schedule_next_attempt(notifications)
+    return notifications
+
+
+def retry_notifications(notifications: list[Notification]) -> int:
+    """
+    Send notifications again through the backend of their message type,
+    return the number of sent notifications.
+    """
+    groups = {}
+    for notification in notifications:
+        groups.setdefault(notification.message.msg_type, []).append(notification)
+
+    for msg_type, group in groups.items():
+        try:
+            backend_cls = get_notification_backend_class(msg_type)
+            with backend_pool.get(backend_cls, fail_silently=True) as backend:
+                backend.retry(group)
+        except Exception:
+            logger.exception("Failed to retry %s notifications", msg_type)
+
+    return sum(notification.is_sent for notification in notifications)
+
+
+def run_retry(batch_size: int = 100, sleep: float = 5, once: bool = False) -> int:
+    """
+    Retry unsent notifications until stopped, or until none is due with `once`.
+    Return the number of sent notifications.
+    """
+    sent = 0
+    while True:
+        notifications = claim_notifications(batch_size)
+        if not notifications:
+            if once:
+                return sent
+            time.sleep(sleep)
+            continue
+
+        sent += retry_notifications(notifications)
@@ -0,0 +1,38 @@
+from django.core.signals import setting_changed
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from notification.cache import invalidate_template
+from notification.counters import incr_unread_counts
+from notification.http import reset_session
+from notification.models import MessageTemplate, Notification
+from notification.pool import backend_pool
+from notification.ratelimit import reset_rate_limiters
+
+
+@receiver([post_save, post_delete], sender=MessageTemplate)
+def clear_template_cache(sender, instance, **kwargs):
+    """
+    Drop cached entries of the saved or deleted template
+    """
+    invalidate_template(instance.code)
+
+
+@receiver(post_save, sender=Notification)
+def count_unread_notification(sender, instance, created, **kwargs):
+    """
+    Count a created unread notification, bulk created ones are counted by backends
+    """
+    if created and not instance.has_read and not instance.is_ignored:
+        incr_unread_counts({instance.to_id: 1})
+
+
+@receiver(setting_changed)
+def reset_http_session(sender, setting, **kwargs):
+    """
+    Recreate http session, rate limiters and backends with the new settings
+    """
+    if setting == "DJANGO_USER_NOTIFICATION":
+        reset_session()
+        reset_rate_limiters()
+        backend_pool.clear()
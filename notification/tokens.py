@@ -0,0 +1,91 @@
+import threading
+import time
+
+from django.core.cache import caches
+
+from notification.http import get_session
+
+DINGTALK_TOKEN_URL = "https://oapi.dingtalk.com/gettoken"
+# Refresh tokens a bit before they really expire
+TOKEN_EXPIRY_MARGIN = 300
+# Error codes of invalid or expired access token
+DINGTALK_INVALID_TOKEN_ERRCODES = (40014, 42001)
+
+
+class AccessTokenStore:
+    """
+    Cache access tokens by app key until they expire. Tokens can be shared with
+    other processes through a django cache, and only one thread per app key
+    refreshes an expired token.
+    """
+
+    def __init__(self, prefix: str) -> None:
+        self.prefix = prefix
+        self._tokens = {}
+        self._locks = {}
+        self._lock = threading.Lock()
+
+    def make_cache_key(self, key: str) -> str:
+        return f"notification:token:{self.prefix}:{key}"
+
+    def _get_lock(self, key: str) -> threading.Lock:
+        with self._lock:
+            return self._locks.setdefault(key, threading.Lock())
+
+    def _get_cached(self, key: str, alias: str = None):
+        token, expires_at = self._tokens.get(key, (None, 0))
+        if token is not None and expires_at > time.monotonic():
+            return token
+
+        if alias:
+            return caches[alias].get(self.make_cache_key(key))
+
+    def get_token(self, key: str, fetch, alias: str = None) -> str:
+        """
+        Get a valid token of key, `fetch` is called to get a new
+        (token, expires_in) pair when there is none.
+        """
+        token = self._get_cached(key, alias)
+        if token is not None:
+            return token
+
+        with self._get_lock(key):
+            token = self._get_cached(key, alias)
+            if token is not None:
+                return token
+
+            token, expires_in = fetch()
+            timeout = max(int(expires_in) - TOKEN_EXPIRY_MARGIN, 0)
+            self._tokens[key] = (token, time.monotonic() + timeout)
+            if alias:
+                caches[alias].set(self.make_cache_key(key), token, timeout)
+            return token
+
+    def invalidate(self, key: str, alias: str = None) -> None:
+        self._tokens.pop(key, None)
+        if alias:
+            caches[alias].delete(self.make_cache_key(key))
+
+
+dingtalk_tokens = AccessTokenStore("dingtalk")
+
+
+def get_dingtalk_access_token(app_key: str, app_secret: str, alias: str = None) -> str:
+    """
+    Get dingtalk access token of app.
+    For details, see: https://open.dingtalk.com/document/orgapp-server/obtain-orgapp-token
+    """  # noqa
+
+    def fetch():
+        params = {"appkey": app_key, "appsecret": app_secret}
+        resp = get_session().get(DINGTALK_TOKEN_URL, params=params)
+        ret = resp.json()
+        if ret.get("errcode"):
+            raise ValueError("Get dingtalk access token failed: %s" % ret["errmsg"])
+        return ret["access_token"], ret["expires_in"]
+
+    return dingtalk_tokens.get_token(app_key, fetch, alias=alias)
+
+
+def invalidate_dingtalk_access_token(app_key: str, alias: str = None) -> None:
+    dingtalk_tokens.invalidate(app_key, alias=alias)
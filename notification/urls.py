@@ -1,7 +1,17 @@
-from django.urls import re_path
+from django.urls import path, re_path
 
-from notification.consumers import NotificationConsumer
+from notification.views import InboxView
 
-wspatterns = [
-    re_path(r"^notify/message/$", NotificationConsumer.as_asgi()),
+urlpatterns = [
+    path("inbox/", InboxView.as_view(), name="notification_inbox"),
 ]
+
+try:
+    from notification.consumers import NotificationConsumer
+except ImportError:
+    # channels is not installed
+    wspatterns = []
+else:
+    wspatterns = [
+        re_path(r"^notify/message/$", NotificationConsumer.as_asgi()),
+    ]
@@ -1,4 +1,39 @@
-from base64 import b64encode
+import binascii
+import hashlib
+import itertools
+import json
+import random
+from base64 import b64encode, urlsafe_b64decode, urlsafe_b64encode
+from datetime import datetime, timedelta
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils.module_loading import import_string
+
+
+class Recipient:
+    """
+    A lightweight recipient of `pk` and field values, loaded instead of
+    user instances for bulk sends.
+    """
+
+    __slots__ = ("pk", "_fields")
+
+    def __init__(self, pk, **fields) -> None:
+        self.pk = pk
+        self._fields = fields
+
+    def __getattr__(self, name):
+        # Only called for names other than slots, e.g. while unpickling
+        if name.startswith("_"):
+            raise AttributeError(name)
+        try:
+            return self._fields[name]
+        except KeyError:
+            raise AttributeError(name)
+
+    def __repr__(self) -> str:
+        return f"<Recipient: {self.pk}>"
 
 
 def make_etag(*args):
@@ -8,23 +43,93 @@ def make_etag(*args):
     return "-".join(b64encode(tag.encode("utf-8")).decode("utf-8") for tag in args)
 
 
+def make_cursor(created_at: datetime, pk: int) -> str:
+    """
+    Make an opaque cursor of inbox position (created_at, pk)
+    """
+    value = f"{created_at.isoformat()}|{pk}".encode("utf-8")
+    return urlsafe_b64encode(value).decode("utf-8")
+
+
+def parse_cursor(cursor: str) -> tuple:
+    """
+    Parse cursor made by `make_cursor`, raise ValueError if it is invalid.
+    """
+    try:
+        created_at, pk = urlsafe_b64decode(cursor.encode("utf-8")).decode().split("|")
+        return datetime.fromisoformat(created_at), int(pk)
+    except (TypeError, UnicodeDecodeError, binascii.Error) as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+
+
+def make_content_hash(*args) -> str:
+    """
+    Make sha256 hash of JSON serializable args, e.g. a message and its content
+    """
+    value = json.dumps(args, sort_keys=True, cls=DjangoJSONEncoder, ensure_ascii=False)
+    return hashlib.sha256(value.encode("utf-8")).hexdigest()
+
+
+def get_notification_settings(key: str) -> dict:
+    """
+    Get the ``DJANGO_USER_NOTIFICATION[key]`` settings, empty dict if missing.
+    """
+    return getattr(settings, "DJANGO_USER_NOTIFICATION", {}).get(key) or {}
+
+
 def get_group_name(user_id: int):
     return f"notify-{user_id}"
 
 
+def get_segment_group_name(segment: str, value) -> str:
+    """
+    Get group name of users in a segment, e.g. ``get_segment_group_name("tenant", 1)``
+    """
+    return f"notify-{segment}-{value}"
+
+
+def load_backends() -> None:
+    """
+    Import builtin backends and backends listed in
+    ``settings.DJANGO_USER_NOTIFICATION["backends"]``, so they are registered.
+    """
+    import notification.backends  # noqa
+
+    for path in getattr(settings, "DJANGO_USER_NOTIFICATION", {}).get("backends", ()):
+        import_string(path)
+
+
 def get_notification_backend_class(msg_type):
     """
     Get notification backend.
     """
-    from notification import backends
-    from notification.base import BaseNotificationBackend
-
-    for att in dir(backends):
-        attr_value = (att, getattr(backends, att))
-        if (
-            attr_value is issubclass(BaseNotificationBackend, attr_value)
-            and getattr(attr_value, "id") == msg_type
-        ):
-            return attr_value
-    else:
+    from notification.base import backend_registry
+
+    if msg_type not in backend_registry:
+        load_backends()
+
+    try:
+        return backend_registry[msg_type]
+    except KeyError:
         raise ValueError(f"Notification backend {msg_type} doesn't exist.")
+
+
+def get_backoff(attempts: int, base: float = 60, maximum: float = 3600) -> timedelta:
+    """
+    Get exponential backoff delay after `attempts` failed attempts, with jitter
+    so retries of a burst of failures are spread out.
+    """
+    delay = min(base * 2 ** max(attempts - 1, 0), maximum)
+    return timedelta(seconds=delay * random.uniform(0.5, 1))
+
+
+def chunked(iterable, size: int):
+    """
+    Split iterable into lists of at most `size` items.
+    """
+    iterator = iter(iterable)
+    while True:
+        chunk = list(itertools.islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
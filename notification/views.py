@@ -0,0 +1,87 @@
+import hashlib
+
+from django.http import HttpResponseNotModified, JsonResponse
+from django.views import View
+
+from notification.models import Notification
+from notification.utils import make_cursor, make_etag, parse_cursor
+
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+
+class InboxView(View):
+    """
+    Notifications of the current user, newest first, paginated by an opaque
+    `cursor` and `limit`. Pass `unread=1` to list unread ones only.
+    """
+
+    def get_queryset(self, before):
+        queryset = (
+            Notification.objects.inbox(self.request.user, before=before)
+            .select_related("message")
+            .defer("message__content")
+        )
+        if self.request.GET.get("unread") in ("1", "true"):
+            queryset = queryset.filter(has_read=False)
+        return queryset
+
+    def serialize(self, notification: Notification) -> dict:
+        message = notification.message
+        return {
+            "id": notification.pk,
+            "title": message.title,
+            "msg_type": message.msg_type,
+            "mark": message.mark,
+            "has_read": notification.has_read,
+            "is_sent": notification.is_sent,
+            "created_at": notification.created_at,
+        }
+
+    def get(self, request, *args, **kwargs):
+        if not request.user.is_authenticated:
+            return JsonResponse({"detail": "Authentication required"}, status=401)
+
+        cursor = request.GET.get("cursor")
+        try:
+            before = parse_cursor(cursor) if cursor else None
+            limit = int(request.GET.get("limit", DEFAULT_PAGE_SIZE))
+        except ValueError as e:
+            return JsonResponse({"detail": str(e)}, status=400)
+        if limit < 1:
+            return JsonResponse({"detail": "limit must be positive"}, status=400)
+        limit = min(limit, MAX_PAGE_SIZE)
+
+        # Fetch one more row to know if there is a next page
+        notifications = list(self.get_queryset(before)[: limit + 1])
+        next_cursor = None
+        if len(notifications) > limit:
+            notifications = notifications[:limit]
+            last = notifications[-1]
+            next_cursor = make_cursor(last.created_at, last.pk)
+
+        unread_count = Notification.objects.unread_count(request.user)
+        page = "|".join(
+            [request.get_full_path()]
+            + [f"{n.pk}:{n.updated_at.isoformat()}" for n in notifications]
+        )
+        etag = '"{}"'.format(
+            make_etag(
+                str(request.user.pk),
+                hashlib.md5(page.encode("utf-8")).hexdigest(),
+                str(unread_count),
+            )
+        )
+        if etag in request.headers.get("If-None-Match", ""):
+            return HttpResponseNotModified(headers={"ETag": etag})
+
+        response = JsonResponse(
+            {
+                "results": [self.serialize(n) for n in notifications],
+                "next": next_cursor,
+                "unread_count": unread_count,
+            }
+        )
+        response["ETag"] = etag
+        response["Cache-Control"] = "private, no-cache"
+        return response
@@ -0,0 +1,72 @@
+import pytest
+from django.core.cache import cache
+
+from notification.cache import compiled_templates, message_templates
+from notification.http import reset_session
+from notification.pool import backend_pool
+from notification.ratelimit import reset_rate_limiters
+
+
+@pytest.fixture(autouse=True)
+def clear_caches():
+    """
+    Process-local caches must not leak between tests
+    """
+    cache.clear()
+    compiled_templates.clear()
+    message_templates.clear()
+    backend_pool.clear()
+    reset_rate_limiters()
+    yield
+    cache.clear()
+    backend_pool.clear()
+
+
+@pytest.fixture
+def users(django_user_model):
+    return [
+        django_user_model.objects.create(username=f"user{i}", email=f"user{i}@a.com")
+        for i in range(5)
+    ]
+
+
+class FakeResponse:
+    def __init__(self, data, status_code=200):
+        self.data = data
+        self.status_code = status_code
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return self.data
+
+
+class FakeSession:
+    """
+    Session recording posted requests and answering them with `data`
+    """
+
+    def __init__(self, data=None, status_code=200):
+        self.data = data
+        self.status_code = status_code
+        self.requests = []
+
+    def post(self, url, **kwargs):
+        self.requests.append((url, kwargs))
+        return FakeResponse(self.data, self.status_code)
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def http_session(monkeypatch):
+    """
+    Replace the http session shared by backends, also after settings change
+    """
+    session = FakeSession()
+    monkeypatch.setattr("notification.http.create_session", lambda: session)
+    reset_session()
+    yield session
+    reset_session()
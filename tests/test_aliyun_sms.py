@@ -0,0 +1,83 @@
+import pytest
+
+from notification.backends.aliyunsms import notify_by_aliyun_sms
+from notification.models import Notification
+
+
+class FakeClient:
+    instances = []
+
+    def __init__(self, config):
+        self.config = config
+        self.requests = []
+        self.instances.append(self)
+
+    def send_sms(self, request):
+        if request.phone_numbers == "user4":
+            raise RuntimeError("Invalid phone number")
+        self.requests.append(request)
+
+
+@pytest.fixture
+def client_class(settings, monkeypatch):
+    settings.DJANGO_USER_NOTIFICATION = {
+        "aliyunsms": {
+            "access_key_id": "id",
+            "access_key_secret": "secret",
+            "sign_name": "sign",
+        }
+    }
+    monkeypatch.setattr(FakeClient, "instances", [])
+    monkeypatch.setattr(
+        "notification.backends.aliyunsms.Dysmsapi20170525Client", FakeClient
+    )
+    return FakeClient
+
+
+def send(recipients):
+    notify_by_aliyun_sms(
+        recipients,
+        "username",
+        template_code="SMS_1",
+        context={"code": "1234"},
+        save=True,
+        fail_silently=True,
+    )
+
+
+@pytest.mark.django_db
+def test_send_sms(users, django_user_model, client_class):
+    send(django_user_model.objects.order_by("pk"))
+
+    (client,) = client_class.instances
+    assert [request.phone_numbers for request in client.requests] == [
+        f"user{i}" for i in range(4)
+    ]
+    assert client.requests[0].sign_name == "sign"
+    assert client.requests[0].template_param == '{"code": "1234"}'
+    assert Notification.objects.get(to=users[0]).notify_kwargs == {
+        "phone_numbers": "user0"
+    }
+    assert not Notification.objects.get(to=users[4]).is_sent
+
+
+@pytest.mark.django_db
+def test_client_is_reused_until_settings_change(
+    users, django_user_model, client_class, settings
+):
+    send(django_user_model.objects.all())
+    send(django_user_model.objects.all())
+
+    assert len(client_class.instances) == 1
+
+    settings.DJANGO_USER_NOTIFICATION = {
+        "aliyunsms": {
+            "access_key_id": "new id",
+            "access_key_secret": "secret",
+            "sign_name": "sign",
+        }
+    }
+    send(django_user_model.objects.all())
+
+    assert len(client_class.instances) == 2
+    assert client_class.instances[1].config.access_key_id == "new id"
@@ -0,0 +1,99 @@
+import pytest
+
+from notification.cache import (
+    LRUCache,
+    compiled_templates,
+    get_compiled_template,
+    get_message_template,
+    message_templates,
+)
+from notification.models import MessageTemplate
+
+
+@pytest.fixture
+def template():
+    return MessageTemplate(name="Welcome", code="T01", content="Hello {{ name }}")
+
+
+def test_template_is_compiled_once(template):
+    compiled = get_compiled_template(template)
+
+    assert get_compiled_template(template) is compiled
+
+
+def test_template_is_compiled_again_when_changed(template):
+    compiled = get_compiled_template(template)
+    template.content = "Bye {{ name }}"
+
+    assert get_compiled_template(template) is not compiled
+    assert get_compiled_template(template).source == "Bye {{ name }}"
+
+
+def test_lru_cache_evicts_least_recently_used():
+    cache = LRUCache(maxsize=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    assert len(cache) == 2
+
+
+@pytest.mark.django_db
+def test_saving_template_drops_compiled_template(template):
+    template.save()
+    get_compiled_template(template)
+
+    template.save()
+
+    assert compiled_templates.get(template.code) is None
+
+
+def test_lru_cache_expires_entries(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr("notification.cache.time.monotonic", lambda: now[0])
+    cache = LRUCache()
+    cache.set("a", 1, timeout=10)
+
+    assert cache.get("a") == 1
+    now[0] += 10
+    assert cache.get("a") is None
+
+
+@pytest.mark.django_db
+def test_message_template_is_queried_once(template, django_assert_num_queries):
+    template.save()
+
+    with django_assert_num_queries(1):
+        assert get_message_template("T01") == template
+        assert get_message_template("T01") == template
+
+
+@pytest.mark.django_db
+def test_message_template_is_invalidated(template):
+    template.save()
+    get_message_template("T01")
+
+    template.content = "Bye {{ name }}"
+    template.save()
+    assert get_message_template("T01").content == "Bye {{ name }}"
+
+    template.delete()
+    with pytest.raises(ValueError):
+        get_message_template("T01")
+
+
+@pytest.mark.django_db
+def test_message_template_is_shared_through_django_cache(
+    template, settings, django_assert_num_queries
+):
+    settings.DJANGO_USER_NOTIFICATION = {"template_cache": {"alias": "default"}}
+    template.save()
+    get_message_template("T01")
+    # Another process only has the django cache
+    message_templates.clear()
+
+    with django_assert_num_queries(0):
+        assert get_message_template("T01") == template
@@ -0,0 +1,50 @@
+import pytest
+
+from notification.backends.dingchatbot import notify_by_dingtalk_chatbot
+from notification.models import Notification
+
+
+@pytest.fixture
+def session(settings, http_session):
+    settings.DJANGO_USER_NOTIFICATION = {
+        "dingtalkchatbot": {"webhook": "https://oapi.dingtalk.com/robot/send"}
+    }
+    http_session.data = {"errcode": 0}
+    return http_session
+
+
+@pytest.mark.django_db
+def test_recipients_are_mentioned_in_one_message(users, django_user_model, session):
+    notify_by_dingtalk_chatbot(
+        django_user_model.objects.order_by("pk"),
+        "username",
+        title="Hi",
+        message="A message",
+        save=True,
+    )
+
+    assert len(session.requests) == 1
+    url, kwargs = session.requests[0]
+    mentioned = [f"user{i}" for i in range(5)]
+    assert url == "https://oapi.dingtalk.com/robot/send"
+    assert kwargs["json"]["at"] == {"atMobiles": mentioned}
+    assert kwargs["json"]["markdown"]["text"].startswith(
+        " ".join("@" + username for username in mentioned)
+    )
+    assert Notification.objects.filter(is_sent=True).count() == 5
+
+
+@pytest.mark.django_db
+def test_error_response_fails_all_recipients(users, django_user_model, session):
+    session.data = {"errcode": 310000, "errmsg": "error"}
+
+    notify_by_dingtalk_chatbot(
+        django_user_model.objects.all(),
+        "username",
+        title="Hi",
+        message="A message",
+        save=True,
+        fail_silently=True,
+    )
+
+    assert Notification.objects.filter(is_sent=False).count() == 5
@@ -0,0 +1,70 @@
+import pytest
+
+from notification.backends.dingtodotask import (
+    DingTalkToDoTaskNotificationBackend,
+    notify_by_dingtalk_todotask,
+)
+from notification.models import Notification
+
+
+@pytest.fixture
+def session(monkeypatch, settings, http_session):
+    settings.DJANGO_USER_NOTIFICATION = {
+        "dingtalktodotask": {"app_key": "key", "app_secret": "secret"}
+    }
+    monkeypatch.setattr(
+        DingTalkToDoTaskNotificationBackend, "get_access_token", lambda self: "t"
+    )
+    http_session.data = {"id": "task"}
+    return http_session
+
+
+@pytest.mark.django_db
+def test_tasks_are_created_with_the_shared_session(users, django_user_model, session):
+    notify_by_dingtalk_todotask(
+        django_user_model.objects.order_by("pk"),
+        "username",
+        title="Hi",
+        message="A task",
+        priority=20,
+        save=True,
+    )
+
+    assert [url for url, _ in session.requests] == [
+        f"https://api.dingtalk.com/v1.0/todo/users/user{i}/tasks" for i in range(5)
+    ]
+    url, kwargs = session.requests[0]
+    assert kwargs["headers"] == {"x-acs-dingtalk-access-token": "t"}
+    assert kwargs["json"]["executorIds"] == ["user0"]
+    assert kwargs["json"]["subject"] == "Hi"
+    assert kwargs["json"]["priority"] == 20
+    assert Notification.objects.get(to=users[0]).notify_kwargs == {
+        "unionid": "user0",
+        "executorIds": ["user0"],
+    }
+    assert Notification.objects.filter(is_sent=True).count() == 5
+
+
+@pytest.mark.django_db
+def test_unauthorized_response_invalidates_token(
+    users, django_user_model, session, monkeypatch
+):
+    invalidated = []
+    monkeypatch.setattr(
+        DingTalkToDoTaskNotificationBackend,
+        "invalidate_access_token",
+        lambda self: invalidated.append(self.app_key),
+    )
+    session.data, session.status_code = {"message": "token expired"}, 401
+
+    notify_by_dingtalk_todotask(
+        django_user_model.objects.filter(pk=users[0].pk),
+        "username",
+        title="Hi",
+        message="A task",
+        save=True,
+        fail_silently=True,
+    )
+
+    assert invalidated == ["key"]
+    assert not Notification.objects.get(to=users[0]).is_sent
@@ -0,0 +1,123 @@
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from notification.backends import anotify
+from notification.backends.dingworkmessage import (
+    DingTalkWorkMessageNotificationBackend,
+    notify_by_dingtalk_workmessage,
+)
+from notification.models import Notification
+
+
+@pytest.fixture
+def workmessage_settings(settings):
+    settings.DJANGO_USER_NOTIFICATION = {
+        "dingtalkworkmessage": {
+            "agent_id": 1,
+            "app_key": "key",
+            "app_secret": "secret",
+            "batch_send": True,
+            "userid_batch_size": 2,
+        }
+    }
+    return settings.DJANGO_USER_NOTIFICATION["dingtalkworkmessage"]
+
+
+@pytest.fixture
+def session(monkeypatch, workmessage_settings, http_session):
+    http_session.data = {"errcode": 0, "task_id": 42}
+    monkeypatch.setattr(
+        DingTalkWorkMessageNotificationBackend, "get_access_token", lambda self: "t"
+    )
+    return http_session
+
+
+@pytest.mark.django_db
+def test_userid_list_is_sent_in_batches(users, django_user_model, session):
+    notify_by_dingtalk_workmessage(
+        django_user_model.objects.order_by("pk"),
+        "username",
+        title="Hi",
+        message="A message",
+        save=True,
+    )
+
+    assert [kwargs["json"]["userid_list"] for _, kwargs in session.requests] == [
+        "user0,user1",
+        "user2,user3",
+        "user4",
+    ]
+    assert {
+        n.to.username: n.notify_kwargs for n in Notification.objects.filter(is_sent=True)
+    } == {f"user{i}": {"userid_list": f"user{i}", "task_id": 42} for i in range(5)}
+
+
+@pytest.mark.django_db
+def test_one_request_per_user_without_batch_send(
+    users, django_user_model, session, workmessage_settings
+):
+    workmessage_settings["batch_send"] = False
+
+    notify_by_dingtalk_workmessage(
+        django_user_model.objects.all(), "username", title="Hi", message="A message"
+    )
+
+    assert len(session.requests) == 5
+    assert all(
+        "," not in kwargs["json"]["userid_list"] for _, kwargs in session.requests
+    )
+
+
+@pytest.mark.django_db
+def test_failed_batch_marks_all_its_users_failed(users, django_user_model, session):
+    session.data = {"errcode": 88, "errmsg": "error"}
+
+    notify_by_dingtalk_workmessage(
+        django_user_model.objects.all(),
+        "username",
+        title="Hi",
+        message="A message",
+        save=True,
+        fail_silently=True,
+    )
+
+    assert len(session.requests) == 3
+    assert Notification.objects.filter(is_sent=False).count() == 5
+    assert not Notification.objects.filter(notify_kwargs__has_key="task_id").exists()
+
+
+@pytest.mark.django_db(transaction=True)
+def test_async_send_posts_batches_with_httpx(users, session, monkeypatch):
+    posted = []
+
+    def handler(request):
+        posted.append(json.loads(request.content)["userid_list"])
+        return httpx.Response(200, json={"errcode": 0, "task_id": 7})
+
+    async def get_async_client():
+        return httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+    monkeypatch.setattr(
+        "notification.backends.dingworkmessage.get_async_client", get_async_client
+    )
+
+    asyncio.run(
+        anotify(
+            users,
+            title="Hi",
+            message="A message",
+            backends=(DingTalkWorkMessageNotificationBackend,),
+            recipient_field="username",
+            save=True,
+        )
+    )
+
+    assert posted == ["user0,user1", "user2,user3", "user4"]
+    assert not session.requests
+    assert Notification.objects.get(to=users[4]).notify_kwargs == {
+        "userid_list": "user4",
+        "task_id": 7,
+    }
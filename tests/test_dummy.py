@@ -1,3 +1,241 @@
+import asyncio
+import re
 
-def test_send_dummy_notification():
-    assert True
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from notification.backends import (
+    DummyNotificationBackend,
+    anotify,
+    notify,
+    notify_by_dummy,
+)
+from notification.models import Message, Notification
+from notification.pool import backend_pool
+
+
+def count_inserts(queries, table):
+    pattern = re.compile(rf'^INSERT (OR IGNORE )?INTO "{table}"')
+    return sum(bool(pattern.match(q["sql"])) for q in queries)
+
+
+@pytest.mark.django_db
+def test_send_dummy_notification(users):
+    notify_by_dummy(users, title="Hi", message="A message", save=True)
+
+    message = Message.objects.get()
+    assert message.title == "Hi"
+    assert message.content == "A message"
+    assert Notification.objects.filter(message=message, is_sent=True).count() == 5
+
+
+@pytest.mark.django_db
+def test_save_notifications_in_batches(users):
+    with CaptureQueriesContext(connection) as ctx:
+        notify(
+            users,
+            title="Hi",
+            message="A message",
+            backends=(DummyNotificationBackend,),
+            save=True,
+            save_batch_size=2,
+        )
+
+    assert count_inserts(ctx.captured_queries, "message") == 1
+    assert count_inserts(ctx.captured_queries, "notification") == 3
+    assert Notification.objects.count() == 5
+
+
+@pytest.mark.django_db
+def test_save_without_recipients_saves_nothing():
+    notify_by_dummy([], title="Hi", message="A message", save=True)
+
+    assert not Notification.objects.exists()
+
+
+@pytest.mark.django_db
+def test_identical_messages_share_one_row(users):
+    for _ in range(3):
+        notify_by_dummy(users, title="Hi", message="A message", save=True)
+
+    assert Message.objects.count() == 1
+    assert Notification.objects.count() == 15
+
+
+@pytest.mark.django_db
+def test_queryset_recipients_are_sent_in_chunks(users, django_user_model):
+    notify(
+        django_user_model.objects.order_by("pk"),
+        title="Hi",
+        message="A message",
+        backends=(DummyNotificationBackend,),
+        save=True,
+        send_batch_size=2,
+    )
+
+    assert sorted(Notification.objects.values_list("to_id", flat=True)) == sorted(
+        user.pk for user in users
+    )
+
+
+def test_dispatch_yields_results_in_order():
+    backend = DummyNotificationBackend(max_workers=4)
+
+    def square(item):
+        if item == 3:
+            raise ValueError(item)
+        return item * item
+
+    results = list(backend.dispatch(square, range(10)))
+
+    assert [item for item, _, _ in results] == list(range(10))
+    assert results[2] == (2, 4, None)
+    assert isinstance(results[3][2], ValueError)
+
+
+class RecordingBackend(DummyNotificationBackend):
+    id = None
+
+    def perform_send(self, message, recipients, recipient_field, save, **kwargs):
+        self.names = [recipient.get_username() for recipient in recipients]
+
+
+@pytest.mark.django_db
+def test_queryset_recipients_are_projected(users, django_user_model):
+    backend = DummyNotificationBackend()
+    chunks = list(backend.get_recipient_chunks(django_user_model.objects.all(), None))
+
+    assert not isinstance(chunks[0][0], django_user_model)
+    assert not RecordingBackend.projects_recipients()
+
+
+@pytest.mark.django_db
+def test_overridden_backend_gets_user_instances(users, django_user_model):
+    backend = RecordingBackend()
+
+    backend.send(
+        title="Hi", content="A message", recipients=django_user_model.objects.all()
+    )
+
+    assert sorted(backend.names) == sorted(user.username for user in users)
+
+
+class SuccessRecordingBackend(DummyNotificationBackend):
+    id = None
+
+    def on_success(self, message, recipient, save=False, notify_kwargs=None):
+        self.names.append(recipient.username)
+        super().on_success(message, recipient, save, notify_kwargs)
+
+
+@pytest.mark.django_db
+def test_overridden_on_success_gets_user_instances(users, django_user_model):
+    backend = SuccessRecordingBackend()
+    backend.names = []
+
+    backend.send(
+        title="Hi", content="A message", recipients=django_user_model.objects.all()
+    )
+
+    assert sorted(backend.names) == sorted(user.username for user in users)
+
+
+def test_dispatch_reuses_executor():
+    backend = DummyNotificationBackend(max_workers=2)
+
+    list(backend.dispatch(abs, range(3)))
+    executor = backend.get_executor()
+    list(backend.dispatch(abs, range(3)))
+
+    assert backend.get_executor() is executor
+    backend.close()
+    assert backend.get_executor() is not executor
+    backend.close()
+
+
+def test_pool_closes_dropped_backends(settings):
+    settings.DJANGO_USER_NOTIFICATION = {"backend_pool": {"maxsize": 1}}
+    with backend_pool.get(DummyNotificationBackend, max_workers=2) as first:
+        with backend_pool.get(DummyNotificationBackend, max_workers=2) as second:
+            first_executor = first.get_executor()
+            second_executor = second.get_executor()
+
+    # The second one is released first and kept, the first one is dropped
+    assert first_executor._shutdown
+    assert not second_executor._shutdown
+    backend_pool.clear()
+    assert second_executor._shutdown
+
+
+@pytest.mark.django_db(transaction=True)
+def test_anotify_sends_and_saves(users):
+    asyncio.run(
+        anotify(
+            users,
+            title="Hi",
+            message="A message",
+            backends=(DummyNotificationBackend,),
+            save=True,
+        )
+    )
+
+    assert Notification.objects.filter(is_sent=True).count() == 5
+
+
+def test_async_dispatch_yields_results_in_order():
+    backend = DummyNotificationBackend(max_workers=3)
+    running, most_running = set(), []
+
+    async def square(item):
+        running.add(item)
+        most_running.append(len(running))
+        # Later items finish first
+        await asyncio.sleep((10 - item) / 1000)
+        running.discard(item)
+        if item == 3:
+            raise ValueError(item)
+        return item * item
+
+    async def main():
+        return [result async for result in backend.async_dispatch(square, range(10))]
+
+    results = asyncio.run(main())
+
+    assert [item for item, _, _ in results] == list(range(10))
+    assert results[2] == (2, 4, None)
+    assert isinstance(results[3][2], ValueError)
+    assert max(most_running) == 3
+
+
+def test_pool_reuses_backends_with_same_kwargs():
+    with backend_pool.get(DummyNotificationBackend, max_workers=2) as backend:
+        pass
+
+    with backend_pool.get(DummyNotificationBackend, max_workers=2) as same:
+        assert same is backend
+        # Taken instances aren't shared
+        with backend_pool.get(DummyNotificationBackend, max_workers=2) as other:
+            assert other is not backend
+    with backend_pool.get(DummyNotificationBackend, max_workers=3) as other:
+        assert other is not backend
+
+
+def test_pool_is_disabled_with_zero_maxsize(settings):
+    settings.DJANGO_USER_NOTIFICATION = {"backend_pool": {"maxsize": 0}}
+
+    with backend_pool.get(DummyNotificationBackend) as backend:
+        pass
+
+    with backend_pool.get(DummyNotificationBackend) as other:
+        assert other is not backend
+
+
+def test_pool_is_cleared_when_settings_change(settings):
+    with backend_pool.get(DummyNotificationBackend) as backend:
+        pass
+
+    settings.DJANGO_USER_NOTIFICATION = {"dummy": {}}
+
+    with backend_pool.get(DummyNotificationBackend) as other:
+        assert other is not backend
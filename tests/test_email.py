@@ -0,0 +1,118 @@
+from email.mime.text import MIMEText
+
+import pytest
+
+from notification.backends import (
+    EmailNotificationBackend,
+    notify,
+    notify_by_email,
+    notify_many,
+)
+from notification.models import Message, MessageTemplate, Notification
+
+
+@pytest.mark.django_db
+def test_send_email_notification(users, mailoutbox):
+    notify_by_email(users, title="Hi", message="A message", save=True)
+
+    assert sorted(email.to[0] for email in mailoutbox) == sorted(u.email for u in users)
+    assert all(email.subject == "Hi" for email in mailoutbox)
+    notification = Notification.objects.get(to=users[0])
+    assert notification.is_sent
+    assert notification.notify_kwargs == {"to": [users[0].email]}
+
+
+@pytest.mark.django_db
+def test_send_email_with_template(users, mailoutbox):
+    MessageTemplate.objects.create(
+        name="Welcome", code="T01", title="Welcome", content="Hello {{ name }}"
+    )
+
+    notify(
+        users[:1],
+        template_code="T01",
+        context={"name": "Ann"},
+        backends=(EmailNotificationBackend,),
+        recipient_field="email",
+    )
+
+    assert mailoutbox[0].subject == "Welcome"
+    assert mailoutbox[0].body == "Hello Ann"
+
+
+@pytest.mark.django_db
+def test_notify_many_renders_each_recipient(users, mailoutbox):
+    MessageTemplate.objects.create(
+        name="Welcome", code="T01", title="Welcome", content="Hello {{ name }}"
+    )
+
+    notify_many(
+        ((user, {"name": user.username}) for user in users),
+        template_code="T01",
+        backends=(EmailNotificationBackend,),
+        recipient_field="email",
+        save=True,
+        send_batch_size=2,
+    )
+
+    bodies = {email.to[0]: email.body for email in mailoutbox}
+    assert bodies == {user.email: f"Hello {user.username}" for user in users}
+    assert Notification.objects.filter(is_sent=True).count() == 5
+
+
+@pytest.mark.django_db
+def test_send_email_with_attachments(users, mailoutbox):
+    notify_by_email(
+        users[:1],
+        title="Hi",
+        message="A message",
+        attachments=[MIMEText("x"), ("report.csv", "a,b\n", "text/csv")],
+        save=True,
+    )
+
+    assert [a[1:] for a in mailoutbox[0].attachments] == [
+        ("x", "text/plain"),
+        ("a,b\n", "text/csv"),
+    ]
+    assert mailoutbox[0].attachments[1][0] == "report.csv"
+    assert Notification.objects.get().is_sent
+    assert Message.objects.get().content["attachments"][1] == [
+        "report.csv",
+        "YSxiCg==",
+        "text/csv",
+    ]
+
+
+@pytest.mark.django_db
+def test_rate_limit_counts_each_email(users, mailoutbox, settings, monkeypatch):
+    settings.DJANGO_USER_NOTIFICATION = {"email": {"rate_limit": {"rate": 1000}}}
+    throttled = []
+    throttle = EmailNotificationBackend.throttle
+
+    def count_throttle(self):
+        throttled.append(1)
+        throttle(self)
+
+    monkeypatch.setattr(EmailNotificationBackend, "throttle", count_throttle)
+
+    notify_by_email(users, title="Hi", message="A message", connection_batch_size=2)
+
+    assert len(mailoutbox) == 5
+    assert len(throttled) == 5
+
+
+@pytest.mark.django_db
+def test_emails_are_split_between_workers(users, mailoutbox, monkeypatch):
+    chunks = []
+    send_chunk = EmailNotificationBackend.send_chunk
+
+    def record_send_chunk(self, chunk):
+        chunks.append(len(chunk))
+        return send_chunk(self, chunk)
+
+    monkeypatch.setattr(EmailNotificationBackend, "send_chunk", record_send_chunk)
+
+    notify_by_email(users, title="Hi", message="A message", max_workers=2)
+
+    assert sorted(chunks) == [2, 3]
+    assert len(mailoutbox) == 5
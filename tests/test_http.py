@@ -0,0 +1,63 @@
+import asyncio
+
+from requests.adapters import HTTPAdapter
+
+from notification.http import (
+    TimeoutHTTPAdapter,
+    get_async_client,
+    get_session,
+    reset_session,
+)
+
+
+def test_session_is_shared():
+    assert get_session() is get_session()
+
+
+def test_session_is_recreated_when_settings_change(settings):
+    session = get_session()
+
+    settings.DJANGO_USER_NOTIFICATION = {"http": {"timeout": 3, "pool_maxsize": 4}}
+
+    new_session = get_session()
+    assert new_session is not session
+    adapter = new_session.get_adapter("https://oapi.dingtalk.com")
+    assert isinstance(adapter, TimeoutHTTPAdapter)
+    assert adapter.timeout == 3
+    assert adapter._pool_maxsize == 4
+
+
+def test_adapter_applies_default_timeout(monkeypatch):
+    timeouts = []
+    monkeypatch.setattr(
+        HTTPAdapter, "send", lambda self, request, **kwargs: timeouts.append(kwargs)
+    )
+    adapter = TimeoutHTTPAdapter(timeout=5)
+
+    adapter.send(None)
+    adapter.send(None, timeout=1)
+
+    assert [kwargs["timeout"] for kwargs in timeouts] == [5, 1]
+
+
+def test_async_client_is_shared_and_closed_with_loop():
+    async def main():
+        client = await get_async_client()
+        assert await get_async_client() is client
+        return client
+
+    client = asyncio.run(main())
+
+    assert client.is_closed
+
+
+def test_reset_session_closes_async_clients():
+    async def main():
+        client = await get_async_client()
+        reset_session()
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+        assert client.is_closed
+        assert await get_async_client() is not client
+
+    asyncio.run(main())
@@ -0,0 +1,52 @@
+import pytest
+from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
+
+
+@pytest.fixture
+def migrate():
+    def migrate(target):
+        executor = MigrationExecutor(connection)
+        executor.loader.build_graph()
+        executor.migrate([("notification", target)])
+        return executor.loader.project_state(("notification", target)).apps
+
+    yield migrate
+    migrate(MigrationExecutor(connection).loader.graph.leaf_nodes("notification")[0][1])
+
+
+@pytest.mark.django_db(transaction=True)
+def test_deduplicate_messages(migrate):
+    apps = migrate("0009_message_content_json")
+    User = apps.get_model("auth", "User")
+    Message = apps.get_model("notification", "Message")
+    Notification = apps.get_model("notification", "Notification")
+
+    user = User.objects.create(username="user", email="user@a.com")
+    content = str({"subject": "Hi", "body": "A message"})
+    messages = [
+        Message.objects.create(title="Hi", content=content, msg_type="email"),
+        Message.objects.create(title="Hi", content="A message", msg_type="dummy"),
+        Message.objects.create(title="Hi", content=content, msg_type="email"),
+        Message.objects.create(title="Hi", content="[1, 2]", msg_type="dummy"),
+        Message.objects.create(title="Hi", content="A message", msg_type="dummy"),
+    ]
+    for message in messages:
+        Notification.objects.create(to=user, message=message)
+
+    apps = migrate("0010_deduplicate_messages")
+    Message = apps.get_model("notification", "Message")
+    Notification = apps.get_model("notification", "Notification")
+
+    assert list(Message.objects.order_by("pk").values_list("pk", "content_json")) == [
+        (messages[0].pk, {"subject": "Hi", "body": "A message"}),
+        (messages[1].pk, "A message"),
+        (messages[3].pk, "[1, 2]"),
+    ]
+    assert sorted(Notification.objects.values_list("message_id", flat=True)) == [
+        messages[0].pk,
+        messages[0].pk,
+        messages[1].pk,
+        messages[1].pk,
+        messages[3].pk,
+    ]
@@ -0,0 +1,130 @@
+import pytest
+from django.db import connection, transaction
+from django.utils import timezone
+
+from notification.backends import notify_by_dummy
+from notification.models import Message, Notification, notifications_marked
+
+
+@pytest.fixture
+def marked():
+    calls = []
+
+    def receiver(sender, **kwargs):
+        calls.append(kwargs)
+
+    notifications_marked.connect(receiver)
+    yield calls
+    notifications_marked.disconnect(receiver)
+
+
+@pytest.mark.django_db(transaction=True)
+def test_unread_count_is_cached(users, django_assert_num_queries):
+    notify_by_dummy(users[:2], title="Hi", message="A message", save=True)
+
+    assert Notification.objects.unread_count(users[0]) == 1
+    with django_assert_num_queries(0):
+        assert Notification.objects.unread_count(users[0]) == 1
+
+
+@pytest.mark.django_db(transaction=True)
+def test_unread_count_follows_changes(users, django_assert_num_queries):
+    user = users[0]
+    notify_by_dummy([user], title="Hi", message="A message", save=True)
+    assert Notification.objects.unread_count(user) == 1
+
+    notify_by_dummy([user], title="Hi", message="Another message", save=True)
+    with django_assert_num_queries(0):
+        assert Notification.objects.unread_count(user) == 2
+
+    Notification.objects.filter(to=user).first().mark_as_read()
+    with django_assert_num_queries(0):
+        assert Notification.objects.unread_count(user) == 1
+
+    Notification.objects.filter(to=user).mark_ignored()
+    assert Notification.objects.unread_count(user) == 0
+
+    Notification.objects.filter(to=user).update(is_ignored=False, has_read=False)
+    assert Notification.objects.unread_count(user) == 2
+
+
+@pytest.mark.django_db(transaction=True)
+def test_unread_count_is_kept_on_rollback(users):
+    user = users[0]
+    assert Notification.objects.unread_count(user) == 0
+
+    with pytest.raises(RuntimeError), transaction.atomic():
+        notify_by_dummy([user], title="Hi", message="A message", save=True)
+        raise RuntimeError
+
+    assert Notification.objects.unread_count(user) == 0
+
+
+@pytest.mark.django_db
+def test_mark_read_updates_changed_rows(users, marked):
+    notify_by_dummy(users[:3], title="Hi", message="A message", save=True)
+    Notification.objects.filter(to=users[0]).mark_read()
+    marked.clear()
+
+    assert Notification.objects.mark_read() == 2
+    assert not Notification.objects.filter(has_read=False).exists()
+    assert len(marked) == 1
+    assert marked[0]["action"] == "read"
+    assert marked[0]["count"] == 2
+    assert sorted(marked[0]["user_ids"]) == sorted(u.pk for u in users[1:3])
+
+
+@pytest.mark.django_db
+def test_mark_without_changes_sends_nothing(users, marked):
+    notify_by_dummy(users[:1], title="Hi", message="A message", save=True)
+
+    assert Notification.objects.mark_sent() == 0
+    assert Notification.objects.read().mark_ignored() == 0
+    assert not marked
+
+
+@pytest.mark.django_db
+def test_unread_count_ignores_queryset_filters(users):
+    notify_by_dummy(users[:1], title="Hi", message="A message", save=True)
+    notify_by_dummy(users[:1], title="Hi", message="Another message", save=True)
+
+    assert (
+        Notification.objects.filter(message__content="A message").unread_count(users[0])
+        == 2
+    )
+    assert Notification.objects.unread_count(users[0]) == 2
+
+
+@pytest.mark.django_db
+def test_create_identical_message_reuses_row():
+    first = Message.objects.create(title="Hi", content={"body": "A message"})
+    second = Message.objects.create(title="Hi", content={"body": "A message"})
+    other = Message.objects.create(title="Hi", content={"body": "Another message"})
+
+    assert second.pk == first.pk
+    assert other.pk != first.pk
+    assert Message.objects.count() == 2
+
+
+def test_messages_are_not_added_in_admin(rf):
+    from django.contrib.admin.sites import site
+
+    assert not site._registry[Message].has_add_permission(rf.get("/"))
+
+
+@pytest.mark.skipif(connection.vendor != "sqlite", reason="Reads sqlite query plans")
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "get_queryset, index",
+    [
+        (lambda user: Notification.objects.inbox(user), "notification_inbox_idx"),
+        (
+            lambda user: Notification.objects.inbox(user, before=(timezone.now(), 1)),
+            "notification_inbox_idx",
+        ),
+        (lambda user: Notification.objects.unread(user), "notification_unread_idx"),
+        (lambda user: Notification.objects.retryable(3), "notification_retry_idx"),
+    ],
+)
+def test_queries_use_indexes(users, get_queryset, index):
+    assert f"USING INDEX {index}" in get_queryset(users[0]).explain()
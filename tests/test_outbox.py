@@ -0,0 +1,154 @@
+import asyncio
+
+import pytest
+from django.core.mail.backends.locmem import EmailBackend
+from django.db.models import QuerySet
+from django.utils import timezone
+
+from notification.backends import EmailNotificationBackend, anotify, notify
+from notification.models import Notification, OutboxJob
+from notification.outbox import claim_jobs, run_worker
+
+
+@pytest.mark.django_db
+def test_notify_with_outbox_enqueues_jobs(users, mailoutbox, settings):
+    settings.DJANGO_USER_NOTIFICATION = {"outbox": {"batch_size": 2}}
+
+    notify(
+        users,
+        title="Hi",
+        message="A message",
+        backends=(EmailNotificationBackend,),
+        recipient_field="email",
+        save=True,
+        outbox=True,
+    )
+
+    assert not mailoutbox
+    assert sorted(len(job.recipient_ids) for job in OutboxJob.objects.all()) == [
+        1,
+        2,
+        2,
+    ]
+
+
+@pytest.mark.django_db
+def test_worker_delivers_jobs(users, mailoutbox):
+    notify(
+        users,
+        title="Hi",
+        message="A message",
+        backends=(EmailNotificationBackend,),
+        recipient_field="email",
+        save=True,
+        outbox=True,
+    )
+
+    assert run_worker(once=True) == 1
+    assert run_worker(once=True) == 0
+
+    assert sorted(email.to[0] for email in mailoutbox) == sorted(u.email for u in users)
+    assert Notification.objects.filter(is_sent=True).count() == 5
+    job = OutboxJob.objects.get()
+    assert job.status == OutboxJob.STATUS_DONE
+    assert job.attempts == 1
+
+
+@pytest.mark.django_db
+def test_outbox_requires_field_name(users):
+    with pytest.raises(ValueError):
+        notify(
+            users,
+            title="Hi",
+            message="A message",
+            backends=(EmailNotificationBackend,),
+            recipient_field=lambda user: user.email,
+            outbox=True,
+        )
+
+
+@pytest.mark.django_db
+def test_worker_retries_failed_recipients(users, mailoutbox, monkeypatch, settings):
+    settings.DJANGO_USER_NOTIFICATION = {"outbox": {"max_attempts": 2}}
+    send_messages = EmailBackend.send_messages
+    down = {users[0].email}
+
+    def flaky_send_messages(self, messages):
+        if messages[0].to[0] in down:
+            raise ConnectionError("smtp is down")
+        return send_messages(self, messages)
+
+    monkeypatch.setattr(EmailBackend, "send_messages", flaky_send_messages)
+    notify(
+        users[:3],
+        title="Hi",
+        message="A message",
+        backends=(EmailNotificationBackend,),
+        recipient_field="email",
+        save=True,
+        outbox=True,
+    )
+
+    run_worker(once=True)
+
+    job = OutboxJob.objects.get()
+    assert job.status == OutboxJob.STATUS_PENDING
+    assert job.recipient_ids == [users[0].pk]
+    assert "smtp is down" in job.error
+    assert len(mailoutbox) == 2
+    assert Notification.objects.count() == 2
+
+    OutboxJob.objects.update(available_at=timezone.now())
+    run_worker(once=True)
+
+    job.refresh_from_db()
+    assert job.status == OutboxJob.STATUS_FAILED
+    assert job.attempts == 2
+    assert len(mailoutbox) == 2
+    assert not Notification.objects.get(to=users[0]).is_sent
+
+
+@pytest.mark.django_db(transaction=True)
+def test_anotify_with_outbox_enqueues_jobs(users, mailoutbox, settings):
+    settings.DJANGO_USER_NOTIFICATION = {"outbox": {"enabled": True}}
+
+    jobs = asyncio.run(
+        anotify(
+            users,
+            title="Hi",
+            message="A message",
+            backends=(EmailNotificationBackend,),
+            recipient_field="email",
+            save=True,
+        )
+    )
+
+    assert not mailoutbox
+    assert [job.pk for job in jobs] == list(
+        OutboxJob.objects.values_list("pk", flat=True)
+    )
+    assert not Notification.objects.exists()
+
+
+@pytest.mark.django_db
+def test_claim_jobs_locks_only_jobs(users, monkeypatch):
+    notify(
+        users,
+        title="Hi",
+        message="A message",
+        backends=(EmailNotificationBackend,),
+        recipient_field="email",
+        outbox=True,
+    )
+    calls = []
+    select_for_update = QuerySet.select_for_update
+
+    def spy(self, **kwargs):
+        calls.append(kwargs)
+        return select_for_update(self, **kwargs)
+
+    monkeypatch.setattr(QuerySet, "select_for_update", spy)
+
+    assert len(claim_jobs("worker", 10)) == 1
+    # Joined message rows, shared by jobs, must not be locked
+    assert calls == [{"skip_locked": True, "of": ("self",)}]
@@ -0,0 +1,44 @@
+import pytest
+
+from notification.backends import (
+    DingTalkWorkMessageNotificationBackend,
+    DummyNotificationBackend,
+    EmailNotificationBackend,
+    WebsocketNotificationBackend,
+)
+from notification.base import backend_registry
+from notification.utils import get_notification_backend_class
+
+
+class ThirdPartyBackend(DummyNotificationBackend):
+    id = "thirdparty"
+
+
+class CustomEmailBackend(EmailNotificationBackend):
+    pass
+
+
+@pytest.mark.parametrize(
+    "backend_cls",
+    [
+        DingTalkWorkMessageNotificationBackend,
+        DummyNotificationBackend,
+        EmailNotificationBackend,
+        WebsocketNotificationBackend,
+    ],
+)
+def test_builtin_backends_are_registered(backend_cls):
+    assert get_notification_backend_class(backend_cls.id) is backend_cls
+
+
+def test_backends_are_registered_when_defined():
+    assert get_notification_backend_class("thirdparty") is ThirdPartyBackend
+
+
+def test_subclass_inheriting_id_keeps_its_parent_registered():
+    assert backend_registry["email"] is EmailNotificationBackend
+
+
+def test_unknown_backend_raises():
+    with pytest.raises(ValueError, match="unknown"):
+        get_notification_backend_class("unknown")
@@ -0,0 +1,94 @@
+import contextlib
+import datetime
+from types import SimpleNamespace
+
+import pytest
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from notification.backends import notify_by_dummy
+from notification.models import Message, Notification
+from notification.retention import purge
+
+
+@pytest.fixture
+def expired(settings, users):
+    settings.DJANGO_USER_NOTIFICATION = {"retention": {"days": 30}}
+    notify_by_dummy(users[:2], title="Hi", message="A message", save=True)
+    old = timezone.now() - datetime.timedelta(days=31)
+    Message.objects.update(created_at=old)
+    Notification.objects.update(created_at=old)
+
+
+@pytest.mark.django_db
+def test_purge_expired_notifications(expired):
+    assert purge(["dummy"]) == {"notifications": 2, "messages": 1, "outbox_jobs": 0}
+    assert not Message.objects.exists()
+
+
+@pytest.mark.django_db
+def test_purge_keeps_message_reused_meanwhile(expired, users, monkeypatch):
+    atomic = transaction.atomic
+
+    @contextlib.contextmanager
+    def send_then_atomic(*args, **kwargs):
+        # A send reuses the message between its selection and its deletion
+        if not Notification.objects.exists():
+            notify_by_dummy(users[:1], title="Hi", message="A message", save=True)
+        with atomic(*args, **kwargs):
+            yield
+
+    monkeypatch.setattr(
+        "notification.retention.transaction", SimpleNamespace(atomic=send_then_atomic)
+    )
+
+    assert purge(["dummy"])["messages"] == 0
+    assert Notification.objects.get().message == Message.objects.get()
+
+
+@pytest.mark.django_db
+def test_get_or_create_many_recreates_deleted_rows(monkeypatch):
+    Message.objects.get_or_create_many([Message(title="Hi", content="A message")])
+    queryset_class = type(Message.objects.all())
+    bulk_create = queryset_class.bulk_create
+
+    def bulk_create_then_purge(self, *args, **kwargs):
+        # Retention deletes the existing row right after the conflict
+        created = bulk_create(self, *args, **kwargs)
+        monkeypatch.undo()
+        Message.objects.all().delete()
+        return created
+
+    monkeypatch.setattr(
+        type(Message.objects.all()), "bulk_create", bulk_create_then_purge
+    )
+    message = Message(title="Hi", content="A message")
+    Message.objects.get_or_create_many([message])
+
+    assert Message.objects.get().pk == message.pk
+
+
+def open_savepoints(queries, table):
+    """
+    Savepoints open when the first row of table is inserted
+    """
+    savepoints = []
+    for query in queries:
+        sql = query["sql"]
+        if sql.startswith("SAVEPOINT"):
+            savepoints.append(sql.split()[1])
+        elif sql.startswith("RELEASE SAVEPOINT"):
+            savepoints.remove(sql.split()[-1])
+        elif f'INTO "{table}"' in sql:
+            return savepoints
+
+
+@pytest.mark.django_db
+def test_messages_are_saved_with_first_notifications(users):
+    with CaptureQueriesContext(connection) as ctx:
+        notify_by_dummy(users, title="Hi", message="A message", save=True)
+
+    message_savepoints = open_savepoints(ctx.captured_queries, "message")
+    notification_savepoints = open_savepoints(ctx.captured_queries, "notification")
+    assert message_savepoints[0] in notification_savepoints
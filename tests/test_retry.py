@@ -0,0 +1,84 @@
+import datetime
+
+import pytest
+from django.core.mail.backends.locmem import EmailBackend
+from django.utils import timezone
+
+from notification.backends import notify_by_email
+from notification.models import Notification
+from notification.retry import run_retry
+
+
+@pytest.fixture
+def failing_email(monkeypatch):
+    def send_messages(self, messages):
+        raise ConnectionError("smtp is down")
+
+    monkeypatch.setattr(EmailBackend, "send_messages", send_messages)
+    return monkeypatch
+
+
+def make_due():
+    Notification.objects.update(
+        next_attempt_at=timezone.now() - datetime.timedelta(seconds=1)
+    )
+
+
+@pytest.mark.django_db
+def test_failed_notification_is_scheduled(users, failing_email):
+    notify_by_email(
+        users[:2], title="Hi", message="A message", save=True, fail_silently=True
+    )
+
+    for notification in Notification.objects.all():
+        assert not notification.is_sent
+        assert notification.attempts == 1
+        assert notification.next_attempt_at > timezone.now()
+
+
+@pytest.mark.django_db
+def test_retry_sends_due_notifications(users, failing_email, mailoutbox):
+    notify_by_email(
+        users[:2], title="Hi", message="A message", save=True, fail_silently=True
+    )
+    failing_email.undo()
+    make_due()
+
+    assert run_retry(once=True) == 2
+
+    assert sorted(email.to[0] for email in mailoutbox) == sorted(
+        user.email for user in users[:2]
+    )
+    assert Notification.objects.count() == 2
+    assert all(
+        notification.is_sent and notification.attempts == 2
+        for notification in Notification.objects.all()
+    )
+
+
+@pytest.mark.django_db
+def test_retry_skips_notifications_not_due(users, failing_email, mailoutbox):
+    notify_by_email(
+        users[:1], title="Hi", message="A message", save=True, fail_silently=True
+    )
+    failing_email.undo()
+
+    assert run_retry(once=True) == 0
+    assert not mailoutbox
+
+
+@pytest.mark.django_db
+def test_retry_gives_up_after_max_attempts(users, failing_email, settings, mailoutbox):
+    settings.DJANGO_USER_NOTIFICATION = {"retry": {"max_attempts": 2}}
+    notify_by_email(
+        users[:1], title="Hi", message="A message", save=True, fail_silently=True
+    )
+    make_due()
+
+    assert run_retry(once=True) == 0
+    make_due()
+    assert run_retry(once=True) == 0
+
+    notification = Notification.objects.get()
+    assert notification.attempts == 2
+    assert not notification.is_sent
@@ -0,0 +1,76 @@
+import threading
+import time
+
+import pytest
+
+from notification.tokens import AccessTokenStore
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr("notification.tokens.time.monotonic", lambda: now[0])
+    return now
+
+
+def make_fetch(calls, expires_in=7200):
+    def fetch():
+        calls.append(1)
+        return f"token{len(calls)}", expires_in
+
+    return fetch
+
+
+def test_token_is_cached_until_it_expires(clock):
+    store, calls = AccessTokenStore("test"), []
+
+    assert store.get_token("app", make_fetch(calls)) == "token1"
+    clock[0] += 7200 - 300 - 1
+    assert store.get_token("app", make_fetch(calls)) == "token1"
+    # Refreshed a margin before it really expires
+    clock[0] += 1
+    assert store.get_token("app", make_fetch(calls)) == "token2"
+
+
+def test_invalidated_token_is_fetched_again():
+    store, calls = AccessTokenStore("test"), []
+    store.get_token("app", make_fetch(calls))
+
+    store.invalidate("app")
+
+    assert store.get_token("app", make_fetch(calls)) == "token2"
+
+
+def test_only_one_thread_fetches_a_token():
+    store, calls = AccessTokenStore("test"), []
+    fetch = make_fetch(calls)
+
+    def slow_fetch():
+        time.sleep(0.05)
+        return fetch()
+
+    tokens = []
+    threads = [
+        threading.Thread(
+            target=lambda: tokens.append(store.get_token("app", slow_fetch))
+        )
+        for _ in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert tokens == ["token1"] * 8
+
+
+def test_token_is_shared_through_django_cache():
+    calls = []
+    AccessTokenStore("test").get_token("app", make_fetch(calls), alias="default")
+
+    # Another process only has the django cache
+    token = AccessTokenStore("test").get_token("app", make_fetch(calls), alias="default")
+
+    assert token == "token1"
+    assert len(calls) == 1
@@ -0,0 +1,77 @@
+import pytest
+from django.urls import reverse
+
+from notification.backends import notify_by_dummy
+from notification.models import Notification
+
+
+@pytest.fixture
+def inbox(users):
+    for i in range(5):
+        notify_by_dummy(users[:2], title=f"Hi {i}", message=f"Message {i}", save=True)
+    return reverse("notification_inbox")
+
+
+@pytest.mark.django_db
+def test_inbox_requires_login(client, inbox):
+    assert client.get(inbox).status_code == 401
+
+
+@pytest.mark.django_db(transaction=True)
+def test_inbox_pages(client, users, inbox):
+    client.force_login(users[0])
+
+    titles, url = [], inbox + "?limit=2"
+    while url:
+        data = client.get(url).json()
+        assert len(data["results"]) <= 2
+        assert data["unread_count"] == 5
+        titles += [result["title"] for result in data["results"]]
+        url = data["next"] and f"{inbox}?limit=2&cursor={data['next']}"
+
+    assert titles == [f"Hi {i}" for i in reversed(range(5))]
+
+
+@pytest.mark.django_db
+def test_inbox_unread_only(client, users, inbox):
+    client.force_login(users[0])
+    Notification.objects.filter(to=users[0], message__title="Hi 4").mark_read()
+
+    data = client.get(inbox, {"unread": "1"}).json()
+
+    assert [result["title"] for result in data["results"]][0] == "Hi 3"
+
+
+@pytest.mark.django_db
+def test_inbox_bad_cursor(client, users, inbox):
+    client.force_login(users[0])
+
+    assert client.get(inbox, {"cursor": "nope"}).status_code == 400
+    assert client.get(inbox, {"limit": "x"}).status_code == 400
+    assert client.get(inbox, {"limit": "0"}).status_code == 400
+    assert client.get(inbox, {"limit": "-3"}).status_code == 400
+
+
+@pytest.mark.django_db
+def test_inbox_limit_is_capped(client, users, inbox, monkeypatch):
+    monkeypatch.setattr("notification.views.MAX_PAGE_SIZE", 2)
+    client.force_login(users[0])
+
+    data = client.get(inbox, {"limit": "1000"}).json()
+
+    assert len(data["results"]) == 2
+    assert data["next"]
+
+
+@pytest.mark.django_db(transaction=True)
+def test_inbox_etag(client, users, inbox):
+    client.force_login(users[0])
+    etag = client.get(inbox)["ETag"]
+
+    response = client.get(inbox, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 304
+
+    Notification.objects.filter(to=users[0]).first().mark_as_read()
+    response = client.get(inbox, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 200
+    assert response["ETag"] != etag
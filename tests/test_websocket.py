@@ -0,0 +1,135 @@
+import pytest
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+from channels.testing import WebsocketCommunicator
+
+from notification.backends import WebsocketNotificationBackend, notify_by_websocket
+from notification.consumers import NotificationConsumer
+from notification.models import Notification
+from notification.utils import get_group_name, get_segment_group_name
+
+
+@pytest.fixture
+def channel_layer():
+    layer = get_channel_layer()
+    yield layer
+    async_to_sync(layer.flush)()
+
+
+def join(channel_layer, group):
+    channel = async_to_sync(channel_layer.new_channel)()
+    async_to_sync(channel_layer.group_add)(group, channel)
+    return channel
+
+
+@pytest.mark.django_db
+def test_send_websocket_notification(users, django_user_model, channel_layer):
+    channel = join(channel_layer, get_group_name(users[0].pk))
+
+    notify_by_websocket(
+        django_user_model.objects.all(), title="Hi", message="A message", save=True
+    )
+
+    event = async_to_sync(channel_layer.receive)(channel)
+    assert event["type"] == "notify.message"
+    assert event["message"] == "A message"
+    assert Notification.objects.filter(is_sent=True).count() == 5
+
+
+@pytest.mark.django_db
+def test_chunks_are_sent_in_one_loop_entry(
+    users, django_user_model, channel_layer, monkeypatch
+):
+    entries = []
+
+    def count_async_to_sync(func):
+        entries.append(func)
+        return async_to_sync(func)
+
+    monkeypatch.setattr(
+        "notification.backends.websocket.async_to_sync", count_async_to_sync
+    )
+    backend = WebsocketNotificationBackend(send_batch_size=2)
+
+    backend.send("Hi", django_user_model.objects.all(), "A message", save=True)
+
+    assert len(entries) == 1
+    assert Notification.objects.count() == 5
+
+
+@pytest.mark.django_db
+def test_each_recipient_group_gets_one_event(
+    users, django_user_model, channel_layer, monkeypatch
+):
+    channels = [join(channel_layer, get_group_name(user.pk)) for user in users]
+    group_send = channel_layer.group_send
+
+    async def fail_for_last_user(group, message):
+        if group == get_group_name(users[-1].pk):
+            raise RuntimeError("Channel is full")
+        await group_send(group, message)
+
+    monkeypatch.setattr(channel_layer, "group_send", fail_for_last_user)
+
+    WebsocketNotificationBackend(fail_silently=True).send(
+        "Hi", django_user_model.objects.all(), "A message", save=True
+    )
+
+    for channel in channels[:-1]:
+        event = async_to_sync(channel_layer.receive)(channel)
+        assert event["title"] == "Hi"
+    notification = Notification.objects.get(to=users[0])
+    assert notification.is_sent
+    assert notification.notify_kwargs == {"group_name": get_group_name(users[0].pk)}
+    assert not Notification.objects.get(to=users[-1]).is_sent
+
+
+@pytest.mark.django_db
+def test_segment_groups_get_one_event(users, channel_layer):
+    channel = join(channel_layer, "tenant-1")
+
+    notify_by_websocket(title="Hi", message="A message", groups=["tenant-1"], save=True)
+
+    event = async_to_sync(channel_layer.receive)(channel)
+    assert event["message"] == "A message"
+    assert not Notification.objects.exists()
+
+
+def get_segment_groups(scope):
+    return [get_segment_group_name("tenant", scope["user"].pk % 2)]
+
+
+@pytest.mark.django_db(transaction=True)
+def test_consumer_joins_user_and_segment_groups(users, channel_layer, settings):
+    settings.DJANGO_USER_NOTIFICATION = {
+        "websocket": {"groups": "tests.test_websocket.get_segment_groups"}
+    }
+    user = users[0]
+
+    async def main():
+        communicator = WebsocketCommunicator(
+            NotificationConsumer.as_asgi(), "/notify/message/"
+        )
+        communicator.scope["user"] = user
+        connected, _ = await communicator.connect()
+        assert connected
+
+        for group in (
+            get_group_name(user.pk),
+            get_segment_group_name("tenant", user.pk % 2),
+        ):
+            await channel_layer.group_send(
+                group,
+                {
+                    "type": "notify.message",
+                    "msgtype": "notify",
+                    "title": group,
+                    "message": "A message",
+                },
+            )
+            assert (await communicator.receive_json_from())["title"] == group
+
+        await communicator.disconnect()
+        assert not channel_layer.groups.get(get_group_name(user.pk))
+
+    async_to_sync(main)()